@@ -1,9 +1,5 @@
+import logging
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-import os
-import sys
-import json
 from pathlib import Path
 
 # Mock modules for demo purposes
@@ -19,6 +15,9 @@ class MockResumeParser:
         }
 
 class MockJobScraper:
+    def __init__(self, store=None):
+        self.store = store
+    
     def search_jobs(self, skills, location="Remote", job_type="Full-time"):
         """Mock job search for demo"""
         mock_jobs = [
@@ -60,8 +59,30 @@ class MockJobScraper:
             }
         ]
         return mock_jobs
+    
+    def stream_jobs(self, skills, location="Remote", job_type="Full-time"):
+        """Mock streaming job search for demo"""
+        yield "Sample", self.search_jobs(skills, location, job_type)
+
+class MockJobStore:
+    def jobs(self):
+        """Mock job store that keeps nothing between searches"""
+        return []
+    
+    def count(self):
+        return 0
+
+class MockJobStoreIndex:
+    def __init__(self, store):
+        self.store = store
+    
+    def match(self, engine, resume_data, top_k=5):
+        return engine.find_best_matches(resume_data, self.store.jobs(), top_k)
 
 class MockMatchingEngine:
+    def __init__(self, semantic_index=None):
+        self.semantic_index = semantic_index
+    
     def find_best_matches(self, resume_data, jobs, top_k=5):
         """Mock job matching for demo"""
         # Add match scores and skills match to jobs
@@ -84,9 +105,18 @@ class MockEmailService:
         # In a real implementation, this would send actual emails
         return True
 
+class MockEmailOutbox:
+    def enqueue(self, email_service, user_name, user_email, top_matches, resume_data):
+        """Mock outbox that sends right away for demo"""
+        email_service.send_job_recommendations(user_name, user_email, top_matches, resume_data)
+        return 0
+    
+    def metrics(self):
+        return {'depth': 0, 'sent': 0, 'failed': 0, 'latency_avg': 0.0, 'latency_p95': 0.0}
+
 def create_directories():
     """Create necessary directories if they don't exist"""
-    directories = ["data", "uploads", "logs", "templates"]
+    directories = ["data", "uploads", "logs", "templates", "cache"]
     for directory in directories:
         Path(directory).mkdir(exist_ok=True)
 
@@ -96,6 +126,11 @@ try:
     from modules.job_scraper import JobScraper
     from modules.matching_engine import MatchingEngine
     from modules.email_service import EmailService
+    from modules.email_queue import account_key, get_email_outbox
+    from modules.job_store import get_job_store
+    from modules.job_index import JobStoreIndex
+    from modules.semantic_index import get_semantic_index, semantic_matching_available
+    from modules.reporting import set_reporter
     from modules.utils import create_directories, load_config
 except ImportError:
     # Use mock classes if modules are not available
@@ -103,7 +138,16 @@ except ImportError:
     JobScraper = MockJobScraper
     MatchingEngine = MockMatchingEngine
     EmailService = MockEmailService
+    _mock_outbox = MockEmailOutbox()
+    get_email_outbox = lambda: _mock_outbox
+    account_key = lambda sender_email, sender_password: sender_email
+    _mock_job_store = MockJobStore()
+    get_job_store = lambda: _mock_job_store
+    JobStoreIndex = MockJobStoreIndex
+    get_semantic_index = lambda: None
+    semantic_matching_available = lambda: False
     load_config = lambda: {}
+    set_reporter = lambda reporter: None
 
 # Page configuration
 st.set_page_config(
@@ -121,6 +165,94 @@ if 'job_matches' not in st.session_state:
 if 'processing_complete' not in st.session_state:
     st.session_state.processing_complete = False
 
+def report_on_page(level, message):
+    """Show problems reported by the engines (failed sources, unreadable files) on the page"""
+    if level >= logging.ERROR:
+        st.error(message)
+    elif level >= logging.WARNING:
+        st.warning(message)
+    else:
+        st.info(message)
+
+set_reporter(report_on_page)
+
+# How long scraped jobs and match results are reused for the same query
+RESULTS_TTL = 15 * 60
+
+# Process-wide instances shared by every session and rerun, so connection pools,
+# the skills database and in-memory indexes stay warm between searches
+@st.cache_resource(show_spinner=False)
+def get_resume_parser():
+    return ResumeParser()
+
+@st.cache_resource(show_spinner=False)
+def get_job_scraper():
+    return JobScraper(store=get_job_store())
+
+@st.cache_resource(show_spinner=False)
+def get_matching_engine(use_semantic_matching=False):
+    return MatchingEngine(semantic_index=get_semantic_index() if use_semantic_matching else None)
+
+@st.cache_resource(show_spinner=False)
+def get_saved_jobs_index():
+    return JobStoreIndex(get_job_store())
+
+# Cached email services, one per sender and password; the outbox closes replaced ones
+EMAIL_SERVICE_ENTRIES = 8
+
+@st.cache_resource(show_spinner=False, max_entries=EMAIL_SERVICE_ENTRIES)
+def _get_email_service(account, sender_email, _sender_password):
+    # Keyed by the account hash; the underscore keeps the password itself out of the cache key
+    return EmailService(sender_email, _sender_password)
+
+def get_email_service(sender_email, sender_password):
+    return _get_email_service(account_key(sender_email, sender_password), sender_email, sender_password)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def saved_job_count():
+    return get_job_store().count()
+
+class NoJobsFound(Exception):
+    """Raised inside cached functions so an empty scrape (often every source failing) is not memoized"""
+
+@st.cache_data(ttl=RESULTS_TTL, show_spinner=False)
+def _search_jobs(skills, location, job_type):
+    # Created in here so cached calls can replay it; it is cleared before returning
+    progress = st.empty()
+    jobs = []
+    # Sources report back as they finish, so a slow one doesn't block the others
+    for source, source_jobs in get_job_scraper().stream_jobs(list(skills), location, job_type):
+        jobs.extend(source_jobs)
+        progress.caption(f"🔍 {source} returned {len(source_jobs)} jobs ({len(jobs)} so far)...")
+    progress.empty()
+    if not jobs:
+        raise NoJobsFound()
+    return jobs
+
+def search_jobs(skills, location, job_type):
+    """Scraped jobs for a (skills, location, job type) query; empty results are retried on the next call"""
+    try:
+        return _search_jobs(skills, location, job_type)
+    except NoJobsFound:
+        return []
+
+@st.cache_data(ttl=RESULTS_TTL, show_spinner=False)
+def _match_jobs(resume_data, location, job_type, include_saved_jobs, use_semantic_matching, top_k):
+    matching_engine = get_matching_engine(use_semantic_matching)
+    if include_saved_jobs:
+        # Scraped jobs were saved as they arrived, so the store already holds this search too
+        return get_saved_jobs_index().match(matching_engine, resume_data, top_k)
+    jobs = _search_jobs(tuple(resume_data['skills']), location, job_type)
+    return matching_engine.find_best_matches(resume_data, jobs, top_k=top_k)
+
+def match_jobs(resume_data, location, job_type, include_saved_jobs=False, use_semantic_matching=False,
+               top_k=5):
+    """Top matches for a resume among the jobs found for its query (and optionally all saved jobs)"""
+    try:
+        return _match_jobs(resume_data, location, job_type, include_saved_jobs, use_semantic_matching, top_k)
+    except NoJobsFound:
+        return []
+
 def main():
     st.title("🔍 Job Finding AI Assistant")
     st.markdown("### Find Your Perfect Job Match with AI")
@@ -141,6 +273,16 @@ def main():
         job_type = st.selectbox("Job Type", ["Full-time", "Part-time", "Contract", "Internship"])
         experience_level = st.selectbox("Experience Level", 
                                       ["Entry Level", "Mid Level", "Senior Level", "Executive"])
+        include_saved_jobs = st.checkbox(
+            "Also match previously found jobs",
+            help=f"Search the {saved_job_count()} jobs saved from earlier searches as well"
+        )
+        use_semantic_matching = st.checkbox(
+            "Semantic matching",
+            disabled=not semantic_matching_available(),
+            help="Shortlist jobs by meaning with a local embedding model before scoring them "
+                 "(needs the sentence-transformers and chromadb packages)"
+        )
     
     # Main content area
     col1, col2 = st.columns([2, 1])
@@ -169,7 +311,8 @@ def main():
                 return
             
             process_job_search(uploaded_file, user_name, user_email, sender_email, 
-                             sender_password, location, job_type, experience_level)
+                             sender_password, location, job_type, experience_level,
+                             include_saved_jobs, use_semantic_matching)
     
     with col2:
         st.header("📊 Process Status")
@@ -180,7 +323,8 @@ def main():
             display_job_matches()
 
 def process_job_search(uploaded_file, user_name, user_email, sender_email, 
-                      sender_password, location, job_type, experience_level):
+                      sender_password, location, job_type, experience_level,
+                      include_saved_jobs=False, use_semantic_matching=False):
     """Process the entire job search pipeline"""
     
     progress_bar = st.progress(0)
@@ -191,8 +335,7 @@ def process_job_search(uploaded_file, user_name, user_email, sender_email,
         status_text.text("📄 Analyzing your resume...")
         progress_bar.progress(20)
         
-        resume_parser = ResumeParser()
-        resume_data = resume_parser.parse_resume(uploaded_file)
+        resume_data = get_resume_parser().parse_resume(uploaded_file)
         st.session_state.processed_resume = resume_data
         
         st.success(f"✅ Resume parsed successfully! Found {len(resume_data['skills'])} skills.")
@@ -201,8 +344,7 @@ def process_job_search(uploaded_file, user_name, user_email, sender_email,
         status_text.text("🔍 Searching for relevant jobs...")
         progress_bar.progress(40)
         
-        job_scraper = JobScraper()
-        jobs = job_scraper.search_jobs(resume_data['skills'], location, job_type)
+        jobs = search_jobs(tuple(resume_data['skills']), location, job_type)
         
         st.success(f"✅ Found {len(jobs)} potential job opportunities!")
         
@@ -210,26 +352,26 @@ def process_job_search(uploaded_file, user_name, user_email, sender_email,
         status_text.text("🎯 Matching jobs to your profile...")
         progress_bar.progress(60)
         
-        matching_engine = MatchingEngine()
-        top_matches = matching_engine.find_best_matches(resume_data, jobs, top_k=5)
+        if use_semantic_matching:
+            status_text.text("🎯 Loading the semantic model and indexing new jobs...")
+        if jobs or include_saved_jobs:
+            top_matches = match_jobs(resume_data, location, job_type, include_saved_jobs, use_semantic_matching)
+        else:
+            # Nothing to rank, and matching would only scrape the empty search again
+            top_matches = []
         st.session_state.job_matches = top_matches
         
-        # Step 4: Send Email
-        status_text.text("📧 Sending personalized job recommendations...")
+        # Step 4: Queue Email (delivered in the background so the page doesn't wait on SMTP)
+        status_text.text("📧 Queueing personalized job recommendations...")
         progress_bar.progress(80)
         
-        email_service = EmailService(sender_email, sender_password)
-        email_sent = email_service.send_job_recommendations(
-            user_name, user_email, top_matches, resume_data
-        )
+        get_email_outbox().enqueue(get_email_service(sender_email, sender_password),
+                                   user_name, user_email, top_matches, resume_data)
         
         progress_bar.progress(100)
         
-        if email_sent:
-            st.success("🎉 Success! Your personalized job recommendations have been sent to your email!")
-            status_text.text("✅ Process completed successfully!")
-        else:
-            st.warning("⚠️ Jobs found but email sending failed. Check your email configuration.")
+        st.success("🎉 Success! Your personalized job recommendations are on their way to your inbox!")
+        status_text.text("✅ Process completed successfully!")
         
         st.session_state.processing_complete = True
         
@@ -252,7 +394,14 @@ def display_status_panel():
         st.metric("Top Matches", len(st.session_state.job_matches))
     
     if st.session_state.processing_complete:
-        st.success("✅ Email Sent Successfully")
+        st.success("✅ Email Queued for Delivery")
+        
+        metrics = get_email_outbox().metrics()
+        queue_col, latency_col = st.columns(2)
+        queue_col.metric("Emails in Queue", metrics['depth'])
+        latency_col.metric("Avg Delivery Time", f"{metrics['latency_avg']:.1f}s")
+        if metrics['failed']:
+            st.warning(f"⚠️ {metrics['failed']} email(s) could not be delivered. Check your email configuration.")
 
 def display_job_matches():
     """Display the top job matches"""
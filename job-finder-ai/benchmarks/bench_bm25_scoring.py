@@ -0,0 +1,74 @@
+"""Time BM25 skill scoring of one resume against a large synthetic job corpus.
+
+Usage: python benchmarks/bench_bm25_scoring.py [--jobs 100000] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.job_index import JobIndex
+from modules.matching_engine import MatchingEngine
+from modules.utils import tokenize
+
+WORDS = ("build maintain scalable services team customers data pipelines platform reliability design "
+         "review mentor deliver features api cloud testing problem solving machine learning senior "
+         "junior years experience python sql aws docker kubernetes java react communication").split()
+TITLES = ["Senior Software Engineer", "Data Engineer", "Backend Developer", "Machine Learning Engineer",
+          "Product Manager", "DevOps Engineer", "Frontend Developer", "Data Analyst"]
+RESUME = {
+    'skills': ["Python", "SQL", "Machine Learning", "Problem Solving", "Docker", "Kubernetes", "Communication"],
+    'experience_level': "Mid Level"
+}
+
+def make_jobs(count, rng):
+    return [{
+        'title': rng.choice(TITLES),
+        'company': f"Company {number}",
+        'location': "Remote",
+        'description': " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 200))),
+    } for number in range(count)]
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    jobs = make_jobs(args.jobs, rng)
+    engine = MatchingEngine()
+    user_skills = [(skill.lower(), tokenize(skill)) for skill in RESUME['skills']]
+
+    start = time.perf_counter()
+    index = JobIndex(jobs[:-1000])
+    print(f"index {len(index):7d} jobs            {time.perf_counter() - start:7.2f}s")
+
+    # The first lookup of a phrase scans its candidates; later ones reuse the cached postings
+    start = time.perf_counter()
+    engine._calculate_skills_scores(index, user_skills)
+    print(f"first skills scoring              {(time.perf_counter() - start) * 1000:7.1f}ms")
+    seconds = best_of(args.repeat, lambda: engine._calculate_skills_scores(index, user_skills))
+    print(f"skills scoring                    {seconds * 1000:7.1f}ms")
+
+    start = time.perf_counter()
+    index.add_jobs(jobs[-1000:])
+    engine._calculate_skills_scores(index, user_skills)
+    print(f"add 1000 jobs and rescore         {(time.perf_counter() - start) * 1000:7.1f}ms")
+
+    seconds = best_of(args.repeat, lambda: engine.find_best_matches(RESUME, jobs, top_k=5, index=index))
+    print(f"find_best_matches top 5           {seconds * 1000:7.1f}ms")
+
+if __name__ == "__main__":
+    main()
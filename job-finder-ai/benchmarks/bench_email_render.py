@@ -0,0 +1,124 @@
+"""Compare the Jinja2 email renderer (with cached job cards) against the original f-string renderer.
+
+Usage: python benchmarks/bench_email_render.py [--users N] [--jobs N]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.email_renderer import EmailRenderer
+
+def render_fstring(user_name, job_matches, resume_data):
+    """The f-string renderer EmailService used before templates were introduced"""
+    job_cards = []
+    for i, job in enumerate(job_matches, 1):
+        match_percentage = int(job['match_score'] * 100)
+        skills_match = ", ".join(job.get('skills_match', [])[:5])
+
+        job_cards.append(f"""
+            <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin: 15px 0; background: #ffffff;">
+                <h3 style="color: #2c3e50; margin: 0 0 10px 0;">#{i} {job['title']}</h3>
+                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Company:</strong> {job['company']}</p>
+                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Location:</strong> {job['location']}</p>
+                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Type:</strong> {job['job_type']}</p>
+                <div style="background: #ecf0f1; padding: 10px; border-radius: 5px; margin: 10px 0;">
+                    <p style="margin: 0; color: #2c3e50;"><strong>Match Score: {match_percentage}%</strong></p>
+                    <p style="margin: 5px 0; color: #34495e; font-size: 14px;">Matching Skills: {skills_match}</p>
+                </div>
+                <a href="{job['url']}" style="background: #3498db; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">Apply Now</a>
+            </div>
+            """)
+    job_cards_html = "".join(job_cards)
+
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Your Job Recommendations</title>
+        </head>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
+            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px; text-align: center; margin-bottom: 30px;">
+                <h1 style="margin: 0; font-size: 28px;">🎯 Your Perfect Job Matches</h1>
+                <p style="margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">Personalized recommendations powered by AI</p>
+            </div>
+            <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 30px;">
+                <h2 style="color: #2c3e50; margin-top: 0;">Hello {user_name}! 👋</h2>
+                <p>Great news! Our AI has analyzed your resume and found <strong>{len(job_matches)} perfect job matches</strong> tailored to your skills and experience.</p>
+                <p><strong>Your Skills:</strong> {", ".join(resume_data['skills'][:8])}</p>
+                <p><strong>Experience Level:</strong> {resume_data['experience_level']}</p>
+                <p><strong>Analysis Date:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
+            </div>
+            <h2 style="color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px;">🚀 Top Job Recommendations</h2>
+            {job_cards_html}
+            <div style="background: #e8f5e8; border-left: 4px solid #27ae60; padding: 20px; margin: 30px 0; border-radius: 0 8px 8px 0;">
+                <h3 style="color: #27ae60; margin-top: 0;">💡 Pro Tips for Success:</h3>
+                <ul style="color: #2c3e50;">
+                    <li>Tailor your resume for each application</li>
+                    <li>Research the company culture and values</li>
+                    <li>Prepare specific examples of your achievements</li>
+                    <li>Follow up within a week of applying</li>
+                    <li>Practice your interview skills regularly</li>
+                </ul>
+            </div>
+            <div style="text-align: center; padding: 20px; background: #f8f9fa; border-radius: 8px; margin-top: 30px;">
+                <p style="color: #7f8c8d; margin: 0;">Best of luck with your job search! 🍀</p>
+                <p style="color: #7f8c8d; margin: 5px 0 0 0; font-size: 14px;">Generated by Job Finding AI Assistant</p>
+            </div>
+        </body>
+        </html>
+        """
+
+def make_digests(users, jobs):
+    """Digests of 5 matches each, drawn from a shared pool of popular jobs"""
+    rng = random.Random(42)
+    pool = [{
+        'title': f"Senior Python Developer {i}",
+        'company': f"Company {i % 97} Inc.",
+        'location': rng.choice(["Remote", "New York, NY", "Austin, TX"]),
+        'job_type': "Full-time",
+        'url': f"https://example.com/jobs/{i}",
+    } for i in range(jobs)]
+
+    digests = []
+    for user in range(users):
+        matches = [dict(job, match_score=rng.random(), skills_match=["Python", "SQL", "AWS"])
+                   for job in rng.sample(pool, 5)]
+        resume_data = {'skills': ["Python", "SQL", "AWS", "Docker"], 'experience_level': "Mid Level"}
+        digests.append((f"User {user}", matches, resume_data))
+    return digests
+
+def bench(name, render, digests):
+    start = time.perf_counter()
+    for digest in digests:
+        render(*digest)
+    seconds = time.perf_counter() - start
+    print(f"  {name:24s} {len(digests) / seconds:10.0f} renders/s")
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--jobs", type=int, default=500, help="size of the shared job pool")
+    args = parser.parse_args()
+
+    digests = make_digests(args.users, args.jobs)
+    renderer = EmailRenderer()
+    uncached = EmailRenderer(max_cached_cards=0)
+
+    print(f"{args.users} digests of 5 jobs from a pool of {args.jobs}")
+    baseline = bench("f-string", render_fstring, digests)
+    bench("jinja2 (no card cache)", uncached.render, digests)
+    cold = bench("jinja2 (cold card cache)", renderer.render, digests)
+    warm = bench("jinja2 (warm card cache)", renderer.render, digests)
+    print(f"  card cache: {renderer.stats['card_hits']} hits, {renderer.stats['card_misses']} misses; "
+          f"warm speed vs f-string: x{baseline / warm:.2f} (cold x{baseline / cold:.2f})")
+
+if __name__ == "__main__":
+    main()
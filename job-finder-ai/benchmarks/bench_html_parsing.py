@@ -0,0 +1,47 @@
+"""Compare the BeautifulSoup and lxml parser backends on saved search result pages.
+
+Usage: python benchmarks/bench_html_parsing.py [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.html_parsing import PARSER_BACKENDS, get_parser_backend
+from modules.job_sources import IndeedSource, SimplyHiredSource
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PAGES = [
+    (IndeedSource(), FIXTURES / "indeed_search.html"),
+    (SimplyHiredSource(), FIXTURES / "simplyhired_search.html"),
+]
+
+def bench(backend_name, source, content, repeat):
+    """Return (seconds per page, parsed jobs) for one backend on one page"""
+    backend = get_parser_backend(backend_name)
+    jobs = source.parse(content, "Remote", backend)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        source.parse(content, "Remote", backend)
+    return (time.perf_counter() - start) / repeat, jobs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for source, path in PAGES:
+        content = path.read_bytes()
+        results = {name: bench(name, source, content, args.repeat) for name in PARSER_BACKENDS}
+        baseline, baseline_jobs = results["soup"]
+
+        print(f"{source.name} ({path.name}, {len(content) / 1024:.0f} KiB, {len(baseline_jobs)} cards)")
+        for name, (seconds, jobs) in results.items():
+            same = "same output" if jobs == baseline_jobs else "OUTPUT DIFFERS"
+            print(f"  {name:5s} {seconds * 1000:8.3f} ms/page  {1 / seconds:8.1f} pages/s  "
+                  f"x{baseline / seconds:5.1f}  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Measure cold-start import time of the app and the headless modules with `python -X importtime`.
+
+Usage: python benchmarks/bench_import_time.py [--repeat 5] [--top 5] [module ...]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGETS = ["modules.matching_engine", "modules.resume_parser", "modules.bulk_ingest",
+           "modules.job_scraper", "modules.email_queue", "app"]
+
+def import_times(module):
+    """{module: cumulative microseconds} for one fresh interpreter importing module"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        times[name] = int(cumulative)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest top-level packages to list per module")
+    args = parser.parse_args()
+
+    # Imported by interpreter startup (site, .pth hooks) whatever the module
+    startup = set(import_times("sys"))
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs) / 1000
+        # Top-level third-party and stdlib packages, which is where cold-start time usually goes
+        packages = {name: value for name, value in runs[-1].items()
+                    if "." not in name and name not in startup and name not in (module, "modules")}
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        listed = ", ".join(f"{name} {value / 1000:.0f}ms" for name, value in heaviest)
+        print(f"{module:26s} {total:7.1f}ms   {listed}")
+
+if __name__ == "__main__":
+    main()
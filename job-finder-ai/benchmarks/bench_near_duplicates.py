@@ -0,0 +1,102 @@
+"""Time MinHash/LSH near-duplicate detection on synthetic syndicated postings.
+
+Besides syndicated copies, some postings repeat a role in another location (often with
+no description, as SimplyHired lists them); those are distinct jobs and must be kept.
+
+Usage: python benchmarks/bench_near_duplicates.py [--sizes 1000,4000,16000] [--thresholds 0.7,0.8,0.9]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.job_store import job_fingerprint
+from modules.near_duplicates import NearDuplicateDetector
+
+WORDS = ("build maintain scalable services python sql aws docker kubernetes team customers data "
+         "pipelines platform reliability design review mentor deliver features api cloud testing").split()
+TITLES = ["Senior Software Engineer", "Data Engineer", "Backend Developer", "Machine Learning Engineer",
+          "Senior Product Manager", "DevOps Engineer", "Frontend Developer", "Data Analyst"]
+LOCATIONS = ["New York, NY", "London", "Remote", "San Francisco, CA", "Austin, TX", "Berlin"]
+
+def syndicated_copy(job, rng):
+    """The same posting as another board might show it"""
+    words = job['description'].split()
+    words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return {
+        'title': job['title'].replace("Senior", "Sr."),
+        'company': job['company'].replace("Inc.", "Inc"),
+        'location': job['location'].replace(",", ""),
+        'description': " ".join(words),
+        'original': job['id'],
+    }
+
+def other_location(job, rng):
+    """The same role at the same company somewhere else: a different job"""
+    return {
+        'title': job['title'],
+        'company': job['company'],
+        'location': rng.choice([location for location in LOCATIONS if location != job['location']]),
+        'description': "" if rng.random() < 0.5 else job['description'],
+        'other_location': job['id'],
+    }
+
+def make_postings(count, rng, duplicate_rate=0.2, other_location_rate=0.05):
+    """Postings where roughly duplicate_rate of them are syndicated copies of earlier ones
+    and other_location_rate are earlier roles posted in another location"""
+    postings = []
+    originals = []
+    for number in range(count):
+        draw = rng.random()
+        if originals and draw < duplicate_rate:
+            postings.append(syndicated_copy(rng.choice(originals), rng))
+            continue
+        if originals and draw < duplicate_rate + other_location_rate:
+            postings.append(other_location(rng.choice(originals), rng))
+            continue
+        job = {
+            'id': number,
+            'title': rng.choice(TITLES),
+            'company': f"Company {rng.randrange(count)} Inc.",
+            'location': rng.choice(LOCATIONS),
+            'description': " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 80))),
+        }
+        originals.append(job)
+        postings.append(job)
+    return postings
+
+def bench(postings, threshold):
+    size = len(postings)
+    detector = NearDuplicateDetector(threshold)
+    start = time.perf_counter()
+    kept = {id(job) for job in detector.filter(postings)}
+    seconds = time.perf_counter() - start
+
+    dropped = [job for job in postings if id(job) not in kept]
+    true_duplicates = sum(1 for job in postings if 'original' in job)
+    caught = sum(1 for job in dropped if 'original' in job)
+    # Postings exact dedup would keep apart that no kept posting stands in for
+    kept_fingerprints = {job_fingerprint(job) for job in postings if id(job) in kept}
+    merged_locations = sum(1 for job in dropped
+                           if 'other_location' in job and job_fingerprint(job) not in kept_fingerprints)
+    print(f"{size:7d} postings  threshold {threshold:.2f}  {seconds:7.2f}s  {size / seconds:8.0f} postings/s  "
+          f"bands={detector.bands}x{detector.rows}  recall {caught / max(true_duplicates, 1):.1%}  "
+          f"precision {caught / max(len(dropped), 1):.1%}  other-location postings lost {merged_locations}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,4000,16000")
+    parser.add_argument("--thresholds", default="0.7,0.8,0.9")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for size in map(int, args.sizes.split(",")):
+        postings = make_postings(size, rng)
+        for threshold in map(float, args.thresholds.split(",")):
+            bench(postings, threshold)
+
+if __name__ == "__main__":
+    main()
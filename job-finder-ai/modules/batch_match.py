@@ -0,0 +1,137 @@
+"""Batch matching: the top-k jobs for every resume in a JSONL file, without the web app.
+
+Usage: python -m modules.batch_match RESUMES.jsonl -o matches.jsonl [--jobs PATH] [--top-k 5] [--workers N]
+
+RESUMES.jsonl is what modules.bulk_ingest writes. The job corpus is a .json list or
+.jsonl file of jobs, or a job store database (by default the app's cache/jobs.sqlite3).
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from .job_index import JobIndex
+from .job_store import JobStore, job_fingerprint
+from .matching_engine import MatchingEngine
+
+# Fields of each matched job written to the output; descriptions are left out to keep lines short
+MATCH_FIELDS = ('fingerprint', 'title', 'company', 'location', 'job_type', 'url', 'source',
+                'match_score', 'skills_match')
+
+_index: Optional[JobIndex] = None
+_engine: Optional[MatchingEngine] = None
+
+def load_jobs(source: Optional[str] = None) -> List[Dict]:
+    """Jobs from a .json or .jsonl file, or every job in a job store database"""
+    if source is None:
+        return JobStore().jobs()
+    path = Path(source)
+    if path.suffix.lower() not in ('.json', '.jsonl'):
+        if not path.exists():
+            raise FileNotFoundError(f"{source} does not exist")
+        return JobStore(str(path)).jobs()
+
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.suffix.lower() == '.jsonl':
+            jobs = [json.loads(line) for line in file if line.strip()]
+        else:
+            jobs = json.load(file)
+    # Stored jobs carry one already; this lets file matches be joined back to the store
+    for job in jobs:
+        if 'fingerprint' not in job:
+            job['fingerprint'] = job_fingerprint(job)
+    return jobs
+
+def iter_resumes(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (resume id, JSON line) for every non-blank line; ids default to the line number"""
+    with open(path, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            if line.strip():
+                yield str(number), line
+
+def _init_worker(jobs_source: Optional[str] = None):
+    global _index, _engine
+    # Under fork the parent's index is inherited copy-on-write; other start methods build their own
+    if _index is None:
+        _index = JobIndex(load_jobs(jobs_source))
+    _engine = MatchingEngine()
+
+def _match_one(task: Tuple[Tuple[str, str], int]) -> Tuple[str, Optional[List[Dict]], float, Optional[str]]:
+    (resume_id, line), top_k = task
+    start = time.perf_counter()
+    try:
+        resume_data = json.loads(line)
+        resume_id = resume_data.get('source_file', resume_id)
+        matches = _engine.find_best_matches(resume_data, _index.jobs, top_k=top_k, index=_index)
+        matches = [{field: match[field] for field in MATCH_FIELDS if field in match} for match in matches]
+        return resume_id, matches, time.perf_counter() - start, None
+    except Exception as e:
+        return resume_id, None, time.perf_counter() - start, str(e)
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def match_all(resumes: str, output: str, jobs_source: Optional[str] = None, top_k: int = 5,
+              workers: Optional[int] = None, chunksize: int = 16) -> Dict:
+    """Match every resume against the job corpus through a process pool, one JSON line per resume"""
+    global _index
+    stats = {'resumes': 0, 'failed': 0}
+    start = time.perf_counter()
+
+    _index = JobIndex(load_jobs(jobs_source))
+    stats['jobs'] = len(_index)
+    stats['index_seconds'] = time.perf_counter() - start
+
+    latencies = []
+    tasks = ((resume, top_k) for resume in iter_resumes(resumes))
+    try:
+        with open(output, 'w', encoding='utf-8') as out, \
+                multiprocessing.Pool(workers, initializer=_init_worker, initargs=(jobs_source,)) as pool:
+            # Ordered, so output lines follow the input file
+            for resume_id, matches, seconds, error in pool.imap(_match_one, tasks, chunksize=chunksize):
+                stats['resumes'] += 1
+                latencies.append(seconds)
+                if error is not None:
+                    stats['failed'] += 1
+                    print(f"Failed to match {resume_id}: {error}", file=sys.stderr)
+                    continue
+                out.write(json.dumps({'resume': resume_id, 'matches': matches}, ensure_ascii=False) + '\n')
+    finally:
+        _index = None
+
+    latencies.sort()
+    stats['elapsed_seconds'] = time.perf_counter() - start
+    match_seconds = stats['elapsed_seconds'] - stats['index_seconds']
+    stats['resumes_per_second'] = stats['resumes'] / match_seconds if match_seconds else 0.0
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        stats[f'latency_{name}'] = percentile(latencies, fraction)
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match parsed resumes against a job corpus")
+    parser.add_argument('resumes', help="JSONL of parsed resumes, as written by modules.bulk_ingest")
+    parser.add_argument('-o', '--output', required=True, help="JSONL file to write the matches to")
+    parser.add_argument('--jobs', default=None,
+                        help="jobs .json/.jsonl file or job store database (default: the app's job store)")
+    parser.add_argument('-k', '--top-k', type=int, default=5, help="matches to keep per resume")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="matcher processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=16, help="resumes handed to a worker at a time")
+    args = parser.parse_args(argv)
+
+    stats = match_all(args.resumes, args.output, args.jobs, args.top_k, args.workers, args.chunksize)
+
+    print(f"Matched {stats['resumes'] - stats['failed']}/{stats['resumes']} resumes against "
+          f"{stats['jobs']} jobs in {stats['elapsed_seconds']:.2f}s "
+          f"({stats['resumes_per_second']:.1f} resumes/s, index built in {stats['index_seconds']:.2f}s)",
+          file=sys.stderr)
+    print("  latency per resume  " + "  ".join(
+        f"{name} {stats[f'latency_{name}'] * 1000:.1f}ms" for name in ('p50', 'p90', 'p99', 'max')),
+        file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
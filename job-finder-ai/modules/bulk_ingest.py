@@ -0,0 +1,145 @@
+"""Bulk resume ingestion: parse a folder or archive of resumes into JSONL.
+
+Usage: python -m modules.bulk_ingest SOURCE -o resumes.jsonl [--workers N]
+
+SOURCE may be a directory (searched recursively), a .zip archive or a tar archive.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from .resume_parser import MIME_TYPES, ResumeParser
+
+# (kind, container, member): workers open files themselves so only references cross process boundaries
+FileRef = Tuple[str, str, str]
+
+_parser: Optional[ResumeParser] = None
+_include_raw_text = False
+# Zip archives a worker has open, so each one's central directory is read once per worker
+_archives: Dict[str, zipfile.ZipFile] = {}
+
+def iter_resume_files(source: str, extract_dir: Optional[str] = None) -> Iterator[FileRef]:
+    """Yield references to every PDF/DOCX resume in a directory or archive.
+
+    Tar archives can only be read front to back (a compressed one is decompressed from
+    the start to reach any member), so their resumes are extracted in one pass into
+    extract_dir, which must outlive the references, and referenced as plain files.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for file_path in sorted(path.rglob('*')):
+            if file_path.is_file() and file_path.suffix.lower() in MIME_TYPES:
+                yield ('file', str(file_path), str(file_path.relative_to(path)))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if Path(name).suffix.lower() in MIME_TYPES:
+                    yield ('zip', str(path), name)
+    elif tarfile.is_tarfile(path):
+        if extract_dir is None:
+            raise ValueError(f"{source} is a tar archive; an extract_dir is needed to read it")
+        with tarfile.open(path, 'r|*') as archive:
+            for number, member in enumerate(archive):
+                suffix = Path(member.name).suffix.lower()
+                if member.isfile() and suffix in MIME_TYPES:
+                    # Numbered names, so member paths never decide where files are written
+                    extracted = Path(extract_dir) / f"{number}{suffix}"
+                    extracted.write_bytes(archive.extractfile(member).read())
+                    yield ('file', str(extracted), member.name)
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+
+def _read_file(ref: FileRef) -> bytes:
+    kind, container, member = ref
+    if kind == 'file':
+        return Path(container).read_bytes()
+    archive = _archives.get(container)
+    if archive is None:
+        archive = _archives[container] = zipfile.ZipFile(container)
+    return archive.read(member)
+
+def _init_worker(include_raw_text: bool = False):
+    global _parser, _include_raw_text
+    _include_raw_text = include_raw_text
+    # Each worker builds its parser (and skill automaton) once; the content cache is for interactive use
+    _parser = ResumeParser(use_cache=False, keep_raw_text=_include_raw_text)
+
+def _parse_one(ref: FileRef) -> Tuple[str, Optional[Dict], Dict[str, float], Optional[str]]:
+    _, _, name = ref
+    timings = {}
+    try:
+        start = time.perf_counter()
+        content = _read_file(ref)
+        timings['read'] = time.perf_counter() - start
+        text_length = 0
+
+        def counted(chunks):
+            nonlocal text_length
+            for chunk in chunks:
+                text_length += len(chunk.strip())
+                yield chunk
+
+        # Read errors propagate here instead of being reported to a UI
+        chunks = _parser.iter_text(content, MIME_TYPES[Path(name).suffix.lower()])
+        resume_data = _parser.parse_stream(counted(chunks), timings)
+        if not text_length:
+            return name, None, timings, "no text could be extracted"
+        return name, resume_data, timings, None
+    except Exception as e:
+        return name, None, timings, str(e)
+
+def ingest(source: str, output: str, workers: Optional[int] = None, chunksize: int = 8,
+           include_raw_text: bool = False) -> Dict:
+    """Parse every resume under source through a process pool and write one JSON line per resume"""
+    stats = {'files': 0, 'failed': 0, 'stage_seconds': {}}
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix='resumes-') as extract_dir, \
+            open(output, 'w', encoding='utf-8') as out, \
+            multiprocessing.Pool(workers, initializer=_init_worker, initargs=(include_raw_text,)) as pool:
+        for name, resume_data, timings, error in pool.imap_unordered(
+                _parse_one, iter_resume_files(source, extract_dir), chunksize=chunksize):
+            stats['files'] += 1
+            for stage, seconds in timings.items():
+                stats['stage_seconds'][stage] = stats['stage_seconds'].get(stage, 0.0) + seconds
+
+            if error is not None:
+                stats['failed'] += 1
+                print(f"Failed to parse {name}: {error}", file=sys.stderr)
+                continue
+
+            if not include_raw_text:
+                resume_data.pop('raw_text', None)
+            resume_data['source_file'] = name
+            out.write(json.dumps(resume_data, ensure_ascii=False) + '\n')
+
+    stats['elapsed_seconds'] = time.perf_counter() - start
+    stats['files_per_second'] = stats['files'] / stats['elapsed_seconds'] if stats['elapsed_seconds'] else 0.0
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a folder or archive of resumes into JSONL")
+    parser.add_argument('source', help="directory, .zip or tar archive of PDF/DOCX resumes")
+    parser.add_argument('-o', '--output', required=True, help="JSONL file to write")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=8, help="files handed to a worker at a time")
+    parser.add_argument('--include-raw-text', action='store_true', help="keep the extracted text in the output")
+    args = parser.parse_args(argv)
+
+    stats = ingest(args.source, args.output, args.workers, args.chunksize, args.include_raw_text)
+
+    print(f"Parsed {stats['files'] - stats['failed']}/{stats['files']} files in "
+          f"{stats['elapsed_seconds']:.2f}s ({stats['files_per_second']:.1f} files/s)", file=sys.stderr)
+    for stage, seconds in sorted(stats['stage_seconds'].items()):
+        # Stage times are summed over workers, so they can exceed the wall-clock time
+        per_file = seconds / stats['files'] * 1000 if stats['files'] else 0.0
+        print(f"  {stage:20s} {seconds:8.2f}s total  {per_file:8.2f} ms/file", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
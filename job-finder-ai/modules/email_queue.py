@@ -0,0 +1,272 @@
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from . import reporting
+from .email_service import EmailService
+
+def account_key(sender_email: str, sender_password: str) -> str:
+    """Identify a sender's credentials without keeping them: the sender plus a slow salted hash of the password"""
+    digest = hashlib.pbkdf2_hmac('sha256', sender_password.encode('utf-8'), sender_email.encode('utf-8'),
+                                 100_000, dklen=8)
+    return f"{sender_email}#{digest.hex()}"
+
+class EmailQueue:
+    """SQLite-backed outbox of recommendation emails that survives restarts"""
+
+    def __init__(self, path: str = 'cache/email_queue.sqlite3'):
+        self.path = path
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly so claims can take the write lock up front
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sender TEXT NOT NULL,
+                account TEXT,
+                recipient TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                enqueued_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)')
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(outbox)')}
+        if 'account' not in columns:
+            # Queues from before accounts existed; their rows go to any service for the sender
+            self._conn.execute('ALTER TABLE outbox ADD COLUMN account TEXT')
+
+    def enqueue(self, sender_email: str, user_name: str, user_email: str,
+                job_matches: List[Dict], resume_data: Dict, account: Optional[str] = None) -> int:
+        """Add a recommendations email to the outbox, to be sent with the account's credentials, and return its id"""
+        payload = json.dumps({
+            'user_name': user_name,
+            'user_email': user_email,
+            'job_matches': job_matches,
+            # The email only shows skills and experience level, so the rest of the resume stays out of the queue
+            'resume_data': {
+                'skills': resume_data.get('skills', []),
+                'experience_level': resume_data.get('experience_level', '')
+            }
+        }, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO outbox (sender, account, recipient, payload, next_attempt_at, enqueued_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (sender_email, account, user_email, payload, now, now)
+            )
+        return cursor.lastrowid
+
+    def claim(self, accounts: List[str]) -> Optional[Dict]:
+        """Atomically take the oldest due message queued for one of the given accounts (see account_key)"""
+        if not accounts:
+            return None
+        senders = sorted({account.rsplit('#', 1)[0] for account in accounts})
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    f'''SELECT id, sender, account, payload, attempts, enqueued_at FROM outbox
+                        WHERE status = 'pending' AND next_attempt_at <= ?
+                          AND (account IN ({', '.join('?' * len(accounts))})
+                               OR (account IS NULL AND sender IN ({', '.join('?' * len(senders))})))
+                        ORDER BY next_attempt_at LIMIT 1''',
+                    (time.time(), *accounts, *senders)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE outbox SET status = 'sending' WHERE id = ?", (row[0],))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        if row is None:
+            return None
+        message_id, sender, account, payload, attempts, enqueued_at = row
+        return {'id': message_id, 'sender': sender, 'account': account, 'payload': json.loads(payload),
+                'attempts': attempts, 'enqueued_at': enqueued_at}
+
+    def mark_sent(self, message_id: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = 'sent', sent_at = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                (time.time(), message_id)
+            )
+
+    def mark_failed(self, message_id: int, error: str, max_attempts: int, backoff: float) -> None:
+        """Schedule a retry with exponential backoff, or give up after max_attempts"""
+        with self._lock:
+            attempts = self._conn.execute('SELECT attempts FROM outbox WHERE id = ?', (message_id,)).fetchone()[0] + 1
+            if attempts >= max_attempts:
+                self._conn.execute("UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                                   (attempts, error, message_id))
+            else:
+                delay = backoff * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+                self._conn.execute(
+                    "UPDATE outbox SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                    (attempts, error, time.time() + delay, message_id)
+                )
+
+    def release(self, message_id: int) -> None:
+        """Put a claimed message back in the queue without counting an attempt"""
+        with self._lock:
+            self._conn.execute("UPDATE outbox SET status = 'pending' WHERE id = ? AND status = 'sending'",
+                               (message_id,))
+
+    def recover(self) -> int:
+        """Return messages left in 'sending' by a crashed process to the queue"""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+        return cursor.rowcount
+
+    def metrics(self, window: int = 1000) -> Dict[str, float]:
+        """Queue depth by status and delivery latency over the most recent sent messages"""
+        with self._lock:
+            counts = dict(self._conn.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+            latencies = [row[0] for row in self._conn.execute(
+                "SELECT sent_at - enqueued_at FROM outbox WHERE status = 'sent' ORDER BY sent_at DESC LIMIT ?",
+                (window,)
+            )]
+        latencies.sort()
+
+        def percentile(fraction):
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+
+        return {
+            'depth': counts.get('pending', 0) + counts.get('sending', 0),
+            'sending': counts.get('sending', 0),
+            'sent': counts.get('sent', 0),
+            'failed': counts.get('failed', 0),
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p50': percentile(0.5),
+            'latency_p95': percentile(0.95)
+        }
+
+class EmailOutbox:
+    """Background worker pool draining an EmailQueue through registered EmailServices.
+
+    SMTP credentials are only held in memory, so messages wait in the queue until an
+    EmailService with the credentials they were queued under has been registered in this
+    process. Services are keyed by sender and credentials, so registering a sender again
+    with another password cannot take over mail queued with the working one.
+    """
+
+    def __init__(self, queue: EmailQueue, workers: int = 2, poll_interval: float = 1.0,
+                 max_attempts: int = 5, backoff: float = 30.0):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._services: Dict[str, EmailService] = {}
+        self._services_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def register(self, email_service: EmailService) -> str:
+        """Make a sender's credentials available to the workers and return their account key.
+
+        A different service registered for the same account is replaced and its connections closed.
+        """
+        account = account_key(email_service.sender_email, email_service.sender_password)
+        with self._services_lock:
+            previous = self._services.get(account)
+            self._services[account] = email_service
+        if previous is not None and previous is not email_service:
+            previous.close()
+        self._wakeup.set()
+        return account
+
+    def enqueue(self, email_service: EmailService, user_name: str, user_email: str,
+                job_matches: List[Dict], resume_data: Dict) -> int:
+        """Queue a recommendations email to be sent through email_service and return immediately"""
+        account = self.register(email_service)
+        message_id = self.queue.enqueue(email_service.sender_email, user_name, user_email, job_matches,
+                                        resume_data, account)
+        self._wakeup.set()
+        return message_id
+
+    def metrics(self) -> Dict[str, float]:
+        return self.queue.metrics()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self.queue.recover()
+        self._stop.clear()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            message = None
+            try:
+                with self._services_lock:
+                    accounts = list(self._services)
+                message = self.queue.claim(accounts)
+                if message is None:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                self._deliver(message)
+            except Exception:
+                # A locked or failing database must not kill the worker; poll again after a pause
+                reporting.logger.exception("Email outbox worker error")
+                if message is not None:
+                    self._release(message)
+                self._stop.wait(self.poll_interval)
+
+    def _release(self, message: Dict) -> None:
+        """Return a message whose outcome could not be recorded; start() recovers it if this fails too"""
+        try:
+            self.queue.release(message['id'])
+        except Exception:
+            reporting.logger.exception(f"Could not release email {message['id']}")
+
+    def _deliver(self, message: Dict) -> None:
+        with self._services_lock:
+            email_service = self._services.get(message['account'])
+            if email_service is None:
+                # Queued before accounts existed: any registered service for the sender
+                email_service = next(service for account, service in self._services.items()
+                                     if account.rsplit('#', 1)[0] == message['sender'])
+        try:
+            msg = email_service.build_job_recommendations(**message['payload'])
+            result = email_service.deliver(msg)
+            error = result['error']
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            self.queue.mark_sent(message['id'])
+        else:
+            self.queue.mark_failed(message['id'], error, self.max_attempts, self.backoff)
+
+@lru_cache(maxsize=1)
+def get_email_outbox() -> EmailOutbox:
+    """Process-wide outbox whose workers keep running across Streamlit reruns"""
+    outbox = EmailOutbox(EmailQueue())
+    outbox.start()
+    return outbox
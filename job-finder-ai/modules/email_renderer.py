@@ -0,0 +1,94 @@
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+from markupsafe import Markup, escape
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+CARD_SLOTS = ('rank', 'percentage', 'skills')
+# Every job field job_card.html reads; the cached card is keyed on all of them
+CARD_FIELDS = ('title', 'company', 'location', 'job_type', 'url')
+
+class EmailRenderer:
+    """Renders recommendation emails from templates compiled once, reusing each job's rendered card"""
+
+    def __init__(self, templates_dir: Path = TEMPLATES_DIR, max_cached_cards: int = 10000):
+        # Imported here so importing the email modules stays cheap until an email is rendered
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        self.env = Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            autoescape=select_autoescape(['html']),
+            auto_reload=False
+        )
+        # Compile up front so no send pays for template parsing
+        self.email_template = self.env.get_template('email_template.html')
+        self.card_template = self.env.get_template('job_card.html')
+        # Unguessable markers for the per-user slots, so job content can never be mistaken for one
+        token = secrets.token_hex(8)
+        self._slot_markers = {slot: Markup(f"\x00{token}:{slot}\x00") for slot in CARD_SLOTS}
+        self.max_cached_cards = max_cached_cards
+        self._cards: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'card_hits': 0, 'card_misses': 0}
+
+    def render(self, user_name: str, job_matches: List[Dict], resume_data: Dict) -> str:
+        """Assemble one user's email around the cached job cards"""
+        job_cards = []
+        for rank, job in enumerate(job_matches, 1):
+            parts = self._card_parts(job)
+            # The parts are already escaped markup; only the skills text still needs escaping
+            job_cards.append("".join((
+                parts[0], str(rank),
+                parts[1], str(int(job['match_score'] * 100)),
+                parts[2], escape(", ".join(job.get('skills_match', [])[:5])),
+                parts[3]
+            )))
+
+        return self.email_template.render(
+            user_name=user_name,
+            job_count=len(job_cards),
+            job_cards=Markup("\n    ".join(job_cards)),
+            skills=resume_data['skills'][:8],
+            experience_level=resume_data['experience_level'],
+            analysis_date=datetime.now().strftime('%B %d, %Y')
+        )
+
+    def _card_parts(self, job: Dict) -> Tuple[str, ...]:
+        """Return a job's rendered card split around the per-user slots, rendering it on first use"""
+        key = self._card_key(job)
+        with self._lock:
+            parts = self._cards.get(key)
+            if parts is not None:
+                self._cards.move_to_end(key)
+                self.stats['card_hits'] += 1
+                return parts
+
+        # Only the keyed fields reach the template, so it cannot show one the key misses
+        card_job = dict(zip(CARD_FIELDS, key))
+        html = str(self.card_template.render(job=card_job, **self._slot_markers))
+        parts = []
+        for slot in CARD_SLOTS:
+            head, html = html.split(self._slot_markers[slot], 1)
+            parts.append(head)
+        parts.append(html)
+        parts = tuple(parts)
+
+        with self._lock:
+            self.stats['card_misses'] += 1
+            self._cards[key] = parts
+            while len(self._cards) > self.max_cached_cards:
+                self._cards.popitem(last=False)
+        return parts
+
+    @staticmethod
+    def _card_key(job: Dict) -> tuple:
+        """Identify a card by every job field it shows, so a reposted job with a new URL gets a new card"""
+        return tuple(job.get(field) for field in CARD_FIELDS)
+
+@lru_cache(maxsize=1)
+def get_email_renderer() -> EmailRenderer:
+    """Process-wide renderer so templates are compiled once at startup"""
+    return EmailRenderer()
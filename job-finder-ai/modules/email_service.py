@@ -1,119 +1,221 @@
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
-import streamlit as st
-from datetime import datetime
+from queue import Empty, Queue
+from typing import List, Dict, Iterable, Optional
+from . import reporting
+from .email_renderer import get_email_renderer
+
+# Failures after which a connection is unusable; other SMTP errors concern one message
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+class SMTPConnectionPool:
+    """A few authenticated SMTP connections reused across messages instead of one handshake per email"""
+    
+    def __init__(self, host: str, port: int, username: str, password: str, size: int = 2,
+                 use_tls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle: List[smtplib.SMTP] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            # Local relays and test servers may not require authentication
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is reset and returned after an error about one message,
+        and discarded after a connection failure or any other error"""
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                self._condition.wait()
+            if self._idle:
+                server = self._idle.pop()
+            else:
+                server = None
+                self._open += 1
+        
+        try:
+            if server is None:
+                server = self._connect()
+            yield server
+        except smtplib.SMTPException as e:
+            if server is not None and not isinstance(e, CONNECTION_ERRORS) and self._reset(server):
+                self._release(server)
+            else:
+                self._discard(server)
+            raise
+        except BaseException:
+            self._discard(server)
+            raise
+        else:
+            self._release(server)
+    
+    def _reset(self, server: smtplib.SMTP) -> bool:
+        """Abort a failed transaction so the connection can send the next message"""
+        try:
+            server.rset()
+            return True
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def _release(self, server: smtplib.SMTP):
+        with self._condition:
+            if not self._closed:
+                self._idle.append(server)
+                self._condition.notify()
+                return
+        # Borrowed before the pool was closed: hang up instead of keeping it idle
+        self._quit(server)
+        self._discard(None)
+    
+    def _discard(self, server: Optional[smtplib.SMTP]):
+        if server is not None:
+            server.close()
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+    
+    def close(self):
+        """Politely close every idle connection, and borrowed ones as they come back"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for server in idle:
+            self._quit(server)
+    
+    def _quit(self, server: smtplib.SMTP):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
 
 class EmailService:
-    def __init__(self, sender_email: str, sender_password: str):
+    def __init__(self, sender_email: str, sender_password: str, smtp_server: str = "smtp.gmail.com",
+                 smtp_port: int = 587, use_tls: bool = True, pool_size: int = 2, max_retries: int = 2):
         self.sender_email = sender_email
         self.sender_password = sender_password
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.max_retries = max_retries
+        self.pool = SMTPConnectionPool(smtp_server, smtp_port, sender_email, sender_password,
+                                       size=pool_size, use_tls=use_tls)
     
     def send_job_recommendations(self, user_name: str, user_email: str, 
                                job_matches: List[Dict], resume_data: Dict) -> bool:
         """Send job recommendations via email"""
         
         try:
-            # Create email content
-            subject = f"🎯 Your Personalized Job Recommendations - {len(job_matches)} Perfect Matches!"
-            
-            # Create HTML email body
-            html_body = self._create_email_html(user_name, job_matches, resume_data)
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.sender_email
-            msg['To'] = user_email
-            
-            # Add HTML part
-            html_part = MIMEText(html_body, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
-            
+            msg = self.build_job_recommendations(user_name, user_email, job_matches, resume_data)
+            result = self.deliver(msg)
+            if not result['sent']:
+                raise smtplib.SMTPException(result['error'])
             return True
             
         except Exception as e:
-            st.error(f"Failed to send email: {str(e)}")
+            reporting.error(f"Failed to send email: {str(e)}")
             return False
     
-    def _create_email_html(self, user_name: str, job_matches: List[Dict], resume_data: Dict) -> str:
-        """Create HTML email content"""
+    def build_job_recommendations(self, user_name: str, user_email: str,
+                                  job_matches: List[Dict], resume_data: Dict) -> MIMEMultipart:
+        """Build the recommendations email for one user"""
+        # Create email content
+        subject = f"🎯 Your Personalized Job Recommendations - {len(job_matches)} Perfect Matches!"
         
-        # Generate job cards HTML
-        job_cards_html = ""
-        for i, job in enumerate(job_matches, 1):
-            match_percentage = int(job['match_score'] * 100)
-            skills_match = ", ".join(job.get('skills_match', [])[:5])
-            
-            job_cards_html += f"""
-            <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin: 15px 0; background: #ffffff;">
-                <h3 style="color: #2c3e50; margin: 0 0 10px 0;">#{i} {job['title']}</h3>
-                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Company:</strong> {job['company']}</p>
-                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Location:</strong> {job['location']}</p>
-                <p style="color: #7f8c8d; margin: 5px 0;"><strong>Type:</strong> {job['job_type']}</p>
-                <div style="background: #ecf0f1; padding: 10px; border-radius: 5px; margin: 10px 0;">
-                    <p style="margin: 0; color: #2c3e50;"><strong>Match Score: {match_percentage}%</strong></p>
-                    <p style="margin: 5px 0; color: #34495e; font-size: 14px;">Matching Skills: {skills_match}</p>
-                </div>
-                <a href="{job['url']}" style="background: #3498db; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">Apply Now</a>
-            </div>
-            """
+        # Create HTML email body
+        html_body = self._create_email_html(user_name, job_matches, resume_data)
         
-        # Complete HTML template
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Your Job Recommendations</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
-            
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px; text-align: center; margin-bottom: 30px;">
-                <h1 style="margin: 0; font-size: 28px;">🎯 Your Perfect Job Matches</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">Personalized recommendations powered by AI</p>
-            </div>
-            
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 30px;">
-                <h2 style="color: #2c3e50; margin-top: 0;">Hello {user_name}! 👋</h2>
-                <p>Great news! Our AI has analyzed your resume and found <strong>{len(job_matches)} perfect job matches</strong> tailored to your skills and experience.</p>
-                <p><strong>Your Skills:</strong> {", ".join(resume_data['skills'][:8])}</p>
-                <p><strong>Experience Level:</strong> {resume_data['experience_level']}</p>
-                <p><strong>Analysis Date:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
-            </div>
-            
-            <h2 style="color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px;">🚀 Top Job Recommendations</h2>
-            
-            {job_cards_html}
-            
-            <div style="background: #e8f5e8; border-left: 4px solid #27ae60; padding: 20px; margin: 30px 0; border-radius: 0 8px 8px 0;">
-                <h3 style="color: #27ae60; margin-top: 0;">💡 Pro Tips for Success:</h3>
-                <ul style="color: #2c3e50;">
-                    <li>Tailor your resume for each application</li>
-                    <li>Research the company culture and values</li>
-                    <li>Prepare specific examples of your achievements</li>
-                    <li>Follow up within a week of applying</li>
-                    <li>Practice your interview skills regularly</li>
-                </ul>
-            </div>
-            
-            <div style="text-align: center; padding: 20px; background: #f8f9fa; border-radius: 8px; margin-top: 30px;">
-                <p style="color: #7f8c8d; margin: 0;">Best of luck with your job search! 🍀</p>
-                <p style="color: #7f8c8d; margin: 5px 0 0 0; font-size: 14px;">Generated by Job Finding AI Assistant</p>
-            </div>
-            
-        </body>
-        </html>
-        """
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.sender_email
+        msg['To'] = user_email
+        
+        # Add HTML part
+        html_part = MIMEText(html_body, 'html')
+        msg.attach(html_part)
         
-        return html_template
\ No newline at end of file
+        return msg
+    
+    def send_many(self, messages: Iterable[MIMEMultipart]) -> List[Dict]:
+        """Send many messages over the pooled connections; returns one result per message, in order"""
+        pending = Queue()
+        count = 0
+        for position, msg in enumerate(messages):
+            pending.put((position, msg))
+            count += 1
+        results: List[Dict] = [None] * count
+        
+        def drain():
+            while True:
+                try:
+                    position, msg = pending.get_nowait()
+                except Empty:
+                    return
+                results[position] = self.deliver(msg)
+        
+        # One sender thread per pooled connection keeps every connection busy
+        senders = max(min(self.pool.size, count), 1)
+        with ThreadPoolExecutor(max_workers=senders) as executor:
+            for future in [executor.submit(drain) for _ in range(senders)]:
+                future.result()
+        
+        return results
+    
+    def close(self):
+        """Close the pooled SMTP connections"""
+        self.pool.close()
+    
+    def deliver(self, msg: MIMEMultipart) -> Dict:
+        """Send one message, reconnecting on connection failures; returns its outcome and latency"""
+        start = time.perf_counter()
+        error = None
+        
+        for _ in range(self.max_retries + 1):
+            try:
+                with self.pool.connection() as server:
+                    server.send_message(msg)
+                error = None
+                break
+            except CONNECTION_ERRORS as e:
+                # The broken connection was dropped by the pool; retry on a fresh one
+                error = str(e)
+            except smtplib.SMTPException as e:
+                # Refused login, sender or recipients fail the same way on every attempt
+                error = str(e)
+                break
+            except OSError as e:
+                error = str(e)
+        
+        return {
+            'to': msg['To'],
+            'sent': error is None,
+            'latency': time.perf_counter() - start,
+            'error': error
+        }
+    
+    def _create_email_html(self, user_name: str, job_matches: List[Dict], resume_data: Dict) -> str:
+        """Create HTML email content"""
+        return get_email_renderer().render(user_name, job_matches, resume_data)
@@ -0,0 +1,152 @@
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from .skill_extractor import SkillExtractor
+
+# Patterns run case-sensitively over text lowercased once per chunk, which lets the
+# regex engine skip ahead on literal prefixes instead of case-folding every position
+YEARS_PATTERN = re.compile(r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)')
+EDUCATION_PATTERNS = (
+    re.compile(r'(bachelor|master|phd|doctorate|associate).*?(?:degree|of)'),
+    re.compile(r'(b\.?[ase]\.?|m\.?[ase]\.?|ph\.?d\.?)'),
+    re.compile(r'(university|college|institute)\s+of\s+\w+')
+)
+JOB_TITLE_PATTERNS = (
+    re.compile(r'(software engineer|developer|programmer|analyst|manager|director|consultant)'),
+    re.compile(r'(data scientist|machine learning|ai engineer|devops|product manager)')
+)
+COMPANY_LINE_PATTERN = re.compile(r'^.*(?:inc|llc|corp|ltd|company|technologies).*$', re.MULTILINE)
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})')
+
+SENIOR_INDICATORS = ('senior', 'lead', 'principal', 'architect', 'director', 'manager')
+ENTRY_INDICATORS = ('intern', 'graduate', 'junior', 'entry', 'trainee')
+
+MAX_COMPANIES = 5
+
+class ResumeFieldExtractor:
+    """Fills every resume field from a stream of text chunks, visiting each chunk once"""
+
+    def __init__(self, skill_extractor: SkillExtractor):
+        self.skill_extractor = skill_extractor
+        self.skills = {}
+        self.max_years = None
+        self.has_senior = self.has_entry = False
+        self.education, self.job_titles = set(), set()
+        self.companies = []
+        self.contact = {}
+
+    def feed(self, chunk: str, timings: Optional[Dict[str, float]] = None) -> None:
+        """Scan one chunk for every field, adding per-field seconds to timings under 'fields.<name>'"""
+        if timings is None:
+            timings = {}
+        start = time.perf_counter()
+        # Lowercased once and shared by every pattern below
+        text_lower = chunk.lower()
+        start = self._lap(timings, 'lowercase', start)
+
+        for skill in self.skill_extractor.extract(chunk):
+            self.skills.setdefault(skill, None)
+        start = self._lap(timings, 'skills', start)
+
+        years, senior, entry = experience_signals(text_lower)
+        if years is not None:
+            self.max_years = years if self.max_years is None else max(self.max_years, years)
+        self.has_senior = self.has_senior or senior
+        self.has_entry = self.has_entry or entry
+        start = self._lap(timings, 'experience', start)
+
+        self.education.update(extract_education(chunk, text_lower))
+        start = self._lap(timings, 'education', start)
+
+        self.job_titles.update(extract_job_titles(chunk, text_lower))
+        start = self._lap(timings, 'job_titles', start)
+
+        # Fields that only need their first few matches stop scanning once they have them
+        if len(self.companies) < MAX_COMPANIES:
+            self.companies.extend(extract_companies(chunk, text_lower)[:MAX_COMPANIES - len(self.companies)])
+        start = self._lap(timings, 'companies', start)
+
+        if len(self.contact) < 2:
+            for key, value in extract_contact_info(chunk).items():
+                self.contact.setdefault(key, value)
+        self._lap(timings, 'contact_info', start)
+
+    def result(self) -> Dict:
+        """The fields collected so far, shaped as in resume_data"""
+        return {
+            'skills': list(self.skills),
+            'experience_level': experience_level(self.max_years, self.has_senior, self.has_entry),
+            'education': list(self.education),
+            'job_titles': list(self.job_titles),
+            'companies': list(self.companies),
+            'contact_info': dict(self.contact)
+        }
+
+    @staticmethod
+    def _lap(timings: Dict[str, float], field: str, start: float) -> float:
+        now = time.perf_counter()
+        key = f'fields.{field}'
+        timings[key] = timings.get(key, 0.0) + now - start
+        return now
+
+def experience_signals(text_lower: str) -> Tuple[Optional[int], bool, bool]:
+    """Return (max years of experience, has senior indicator, has entry-level indicator)"""
+    years_matches = YEARS_PATTERN.findall(text_lower)
+    max_years = max(int(year) for year in years_matches) if years_matches else None
+    has_senior = any(indicator in text_lower for indicator in SENIOR_INDICATORS)
+    has_entry = any(indicator in text_lower for indicator in ENTRY_INDICATORS)
+    return max_years, has_senior, has_entry
+
+def experience_level(max_years: Optional[int], has_senior: bool, has_entry: bool) -> str:
+    """Map experience signals to a level"""
+    if max_years is not None:
+        if max_years >= 8:
+            return "Senior Level"
+        elif max_years >= 3:
+            return "Mid Level"
+        else:
+            return "Entry Level"
+    if has_senior:
+        return "Senior Level"
+    if has_entry:
+        return "Entry Level"
+    return "Mid Level"  # Default
+
+def _cased(text: str, text_lower: str) -> str:
+    """The text match offsets found in text_lower can be read back from, keeping the original case"""
+    # A few characters lowercase to more than one, which would shift the offsets
+    return text if len(text) == len(text_lower) else text_lower
+
+def extract_education(text: str, text_lower: str) -> List[str]:
+    """Degree and institution mentions, in the case they were written"""
+    text = _cased(text, text_lower)
+    return list({text[slice(*match.span(1))]
+                 for pattern in EDUCATION_PATTERNS for match in pattern.finditer(text_lower)})
+
+def extract_job_titles(text: str, text_lower: str) -> List[str]:
+    """Job title mentions, in the case they were written"""
+    text = _cased(text, text_lower)
+    return list({text[slice(*match.span(1))]
+                 for pattern in JOB_TITLE_PATTERNS for match in pattern.finditer(text_lower)})
+
+def extract_companies(text: str, text_lower: str) -> List[str]:
+    """Lines that look like company names (simplified; a real version would use NER)"""
+    text = _cased(text, text_lower)
+    companies = []
+    for match in COMPANY_LINE_PATTERN.finditer(text_lower):
+        companies.append(text[match.start():match.end()].strip()[:50])  # Limit length
+        if len(companies) == MAX_COMPANIES:
+            break
+    return companies
+
+def extract_contact_info(text: str) -> Dict[str, str]:
+    """First email address and phone number in the text"""
+    contact = {}
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        contact['email'] = email.group()
+    phone = PHONE_PATTERN.search(text)
+    if phone:
+        contact['phone'] = ''.join(phone.groups(''))
+    return contact
@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml is optional; BeautifulSoup's html.parser still works
+    etree = None
+    lxml_html = None
+
+# A selector is a path of (tag, css class or None) steps, each searched among the previous step's descendants
+Step = Tuple[str, Optional[str]]
+Selector = Sequence[Step]
+
+class CardSpec:
+    """Selectors describing where a source keeps each field of a job card"""
+
+    def __init__(self, card: Step, fields: Dict[str, Selector], links: Dict[str, Selector]):
+        self.card = card
+        self.fields = fields
+        self.links = links
+
+class SoupBackend:
+    """Reference backend walking a BeautifulSoup tree with find/find_all"""
+
+    name = "soup"
+
+    def extract(self, content: bytes, spec: CardSpec) -> List[Dict[str, Optional[str]]]:
+        # Imported on first use, since the lxml backend is the default whenever lxml is installed
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        tag, css_class = spec.card
+        cards = []
+
+        for card in soup.find_all(tag, class_=css_class) if css_class else soup.find_all(tag):
+            values = {}
+            for name, selector in spec.fields.items():
+                elem = self._find(card, selector)
+                values[name] = elem.get_text(strip=True) if elem else None
+            for name, selector in spec.links.items():
+                elem = self._find(card, selector)
+                values[name] = elem.get('href') if elem else None
+            cards.append(values)
+
+        return cards
+
+    @staticmethod
+    def _find(elem, selector: Selector):
+        for tag, css_class in selector:
+            if elem is None:
+                return None
+            elem = elem.find(tag, class_=css_class) if css_class else elem.find(tag)
+        return elem
+
+class LxmlBackend:
+    """Backend evaluating XPath expressions compiled once per card spec with lxml"""
+
+    name = "lxml"
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is required for the lxml parser backend")
+        self._compiled: Dict[int, Tuple] = {}
+
+    def extract(self, content: bytes, spec: CardSpec) -> List[Dict[str, Optional[str]]]:
+        card_xpath, field_xpaths, link_xpaths = self._compile(spec)
+        if not content.strip():
+            return []
+        root = lxml_html.fromstring(content)
+        cards = []
+
+        for card in card_xpath(root):
+            values = {}
+            for name, xpath in field_xpaths:
+                found = xpath(card)
+                values[name] = "".join(text.strip() for text in found[0].itertext()) if found else None
+            for name, xpath in link_xpaths:
+                found = xpath(card)
+                values[name] = found[0].get('href') if found else None
+            cards.append(values)
+
+        return cards
+
+    def _compile(self, spec: CardSpec) -> Tuple:
+        """Return the precompiled XPath objects for a spec, compiling them on first use"""
+        compiled = self._compiled.get(id(spec))
+        if compiled is None:
+            compiled = (
+                etree.XPath(self._to_xpath([spec.card], root=True)),
+                [(name, etree.XPath(self._to_xpath(selector))) for name, selector in spec.fields.items()],
+                [(name, etree.XPath(self._to_xpath(selector))) for name, selector in spec.links.items()],
+            )
+            self._compiled[id(spec)] = compiled
+        return compiled
+
+    @staticmethod
+    def _to_xpath(selector: Selector, root: bool = False) -> str:
+        steps = []
+        for tag, css_class in selector:
+            if css_class:
+                steps.append(f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+            else:
+                steps.append(tag)
+        path = ("//" if root else ".//") + "//".join(steps)
+        # Card-level selectors need every match, field selectors only the first one
+        return path if root else f"({path})[1]"
+
+PARSER_BACKENDS = {
+    SoupBackend.name: SoupBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+def get_parser_backend(name: Optional[str] = None):
+    """Return a parser backend by name, preferring lxml when it is installed"""
+    if name is None:
+        name = LxmlBackend.name if etree is not None else SoupBackend.name
+    return PARSER_BACKENDS[name]()
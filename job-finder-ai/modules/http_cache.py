@@ -0,0 +1,179 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from .utils import normalize_url
+
+# Bodies are stored decoded, so these headers no longer describe them
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+class HTTPCache:
+    """SQLite-backed response cache with TTL, LRU size eviction and ETag/Last-Modified validators"""
+
+    def __init__(self, path: str = 'cache/http_cache.sqlite3', ttl: float = 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, fresh or stale"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?',
+                (normalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, body, etag, last_modified, stored_at = row
+        return {
+            'url': url,
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': time.time() - stored_at < self.ttl
+        }
+
+    def is_fresh(self, url: str) -> bool:
+        """Check whether a URL can be served without touching the network"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT stored_at FROM responses WHERE key = ?', (normalize_url(url),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Save a successful response and evict least recently used entries over the size limit"""
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in DROPPED_HEADERS}
+        body = response.content
+        now = time.time()
+        key = normalize_url(url)
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, response.status_code, json.dumps(headers), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body))
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str, revalidated: bool = False) -> None:
+        """Mark an entry as recently used, restarting its TTL after a 304"""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._conn.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                                   (now, now, normalize_url(url)))
+            else:
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?',
+                                   (now, normalize_url(url)))
+            self._conn.commit()
+
+    def record(self, counter: str) -> None:
+        """Increment one of the hit/miss counters"""
+        with self._lock:
+            self.stats[counter] += 1
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 32'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                self.stats['evictions'] += 1
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+class CachingSession(requests.Session):
+    """requests.Session that serves plain GETs from an HTTPCache and revalidates stale entries"""
+
+    def __init__(self, cache: HTTPCache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs):
+        # Only simple GETs whose URL carries the whole query are cacheable
+        if method.upper() != 'GET' or args or kwargs.get('params') or kwargs.get('data'):
+            return super().request(method, url, *args, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None and entry['fresh']:
+            self.cache.touch(url)
+            self.cache.record('hits')
+            return self._build_response(entry)
+
+        if entry is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+            kwargs['headers'] = headers
+
+        response = super().request(method, url, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url, revalidated=True)
+            self.cache.record('revalidated')
+            return self._build_response(entry)
+
+        self.cache.record('misses')
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            self.cache.store(url, response)
+        return response
+
+    @staticmethod
+    def _build_response(entry: Dict) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = entry['url']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
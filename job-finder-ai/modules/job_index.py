@@ -0,0 +1,245 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from .job_store import JobStore, job_fingerprint
+from .skill_extractor import SkillExtractor
+from .utils import tokenize
+
+if TYPE_CHECKING:
+    from .matching_engine import MatchingEngine
+
+YEARS_PATTERN = re.compile(r'(\d+)\s*(?:years?|yrs?)')
+
+# Okapi BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+class JobIndex:
+    """Inverted index over job postings, tokenized once when a job is added.
+
+    Term frequencies and document lengths are recorded as jobs are added, so the
+    BM25 statistics (document frequency, average length) stay current without a rebuild.
+    """
+
+    def __init__(self, jobs: Iterable[Dict] = (), skill_extractor: Optional[SkillExtractor] = None,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        self.skill_extractor = skill_extractor
+        self.k1 = k1
+        self.b = b
+        self.jobs: List[Dict] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        # Parallel to postings: how often the term occurs in each of those jobs
+        self.term_freqs: Dict[str, List[int]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+        self._total_length = 0
+        self._length_array = np.zeros(0)
+        # Phrase -> (doc ids, frequencies, number of jobs scanned so far)
+        self._phrases: Dict[Tuple[str, ...], Tuple[List[int], List[int], int]] = {}
+        self._token_sets: List[Set[str]] = []
+        self._padded_texts: List[str] = []
+        self._title_tokens: List[Set[str]] = []
+        self._required_years: List[Optional[int]] = []
+        self._job_skills: List[List[str]] = []
+        self._fingerprints: List[str] = []
+        self._doc_ids: Dict[str, int] = {}
+        self.add_jobs(jobs)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> None:
+        """Add several jobs to the index"""
+        for job in jobs:
+            self.add_job(job)
+
+    def add_job(self, job: Dict) -> int:
+        """Tokenize a job once and append it to the posting lists"""
+        doc_id = len(self.jobs)
+        text = f"{job['title']} {job['description']}".lower()
+        tokens = tokenize(text)
+        token_counts = Counter(tokens)
+        token_set = set(token_counts)
+
+        for term, count in token_counts.items():
+            self.postings[term].append(doc_id)
+            self.term_freqs[term].append(count)
+        self._doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+
+        years = [int(year) for year in YEARS_PATTERN.findall(text)]
+
+        self.jobs.append(job)
+        self._token_sets.append(token_set)
+        # Padding lets phrase lookups respect token boundaries
+        self._padded_texts.append(f" {' '.join(tokens)} ")
+        self._title_tokens.append(set(tokenize(job['title'])))
+        self._required_years.append(max(years) if years else None)
+        fingerprint = job.get('fingerprint') or job_fingerprint(job)
+        self._fingerprints.append(fingerprint)
+        self._doc_ids.setdefault(fingerprint, doc_id)
+        if self.skill_extractor is not None:
+            self._job_skills.append(self.skill_extractor.extract(f"{job['title']} {job['description']}"))
+        return doc_id
+
+    def candidates(self, terms: Iterable[str]) -> List[int]:
+        """Return ids of jobs containing at least one of the terms"""
+        doc_ids = set()
+        for term in set(terms):
+            doc_ids.update(self.postings.get(term, ()))
+        return sorted(doc_ids)
+
+    def has_term(self, doc_id: int, term: str) -> bool:
+        """Check whether a job contains a single token"""
+        return term in self._token_sets[doc_id]
+
+    def has_phrase(self, doc_id: int, tokens: List[str]) -> bool:
+        """Check whether a job contains the tokens consecutively"""
+        if not tokens:
+            return False
+        if len(tokens) == 1:
+            return tokens[0] in self._token_sets[doc_id]
+        return f" {' '.join(tokens)} " in self._padded_texts[doc_id]
+
+    def document_frequency(self, tokens: List[str]) -> int:
+        """Number of jobs containing a term or phrase"""
+        return len(self._occurrences(tokens)[0])
+
+    def idf(self, tokens: List[str]) -> float:
+        """BM25 inverse document frequency of a term or phrase (always positive)"""
+        df = self.document_frequency(tokens)
+        return math.log(1 + (len(self.jobs) - df + 0.5) / (df + 0.5))
+
+    def bm25_tf(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Jobs containing a term or phrase, with its saturated, length-normalized frequency.
+
+        One occurrence in a job of average length weighs 1.0; repeats approach k1 + 1.
+        """
+        doc_ids, freqs = self._occurrences(tokens)
+        if not doc_ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        doc_ids = np.array(doc_ids, dtype=np.int64)
+        freqs = np.array(freqs, dtype=np.float64)
+        average_length = self._total_length / len(self.jobs)
+        norms = self.k1 * (1 - self.b + self.b * self._lengths()[doc_ids] / average_length)
+        return doc_ids, freqs * (self.k1 + 1) / (freqs + norms)
+
+    def _occurrences(self, tokens: List[str]) -> Tuple[List[int], List[int]]:
+        """Posting list and frequencies of a term, or of a phrase found by intersecting its terms"""
+        if not tokens:
+            return [], []
+        if len(tokens) == 1:
+            return self.postings.get(tokens[0], []), self.term_freqs.get(tokens[0], [])
+
+        key = tuple(tokens)
+        doc_ids, freqs, scanned = self._phrases.get(key, ([], [], 0))
+        if scanned < len(self.jobs):
+            # Only jobs added since this phrase was last looked up need scanning
+            rarest = min(tokens, key=lambda term: len(self.postings.get(term, ())))
+            postings = self.postings.get(rarest, [])
+            # Padded on both sides so only whole tokens match; a repeat sharing the separating
+            # space ("a b a b") counts once, which saturation makes immaterial anyway
+            phrase = f" {' '.join(tokens)} "
+            for doc_id in postings[bisect_left(postings, scanned):]:
+                if all(term in self._token_sets[doc_id] for term in tokens):
+                    count = self._padded_texts[doc_id].count(phrase)
+                    if count:
+                        doc_ids.append(doc_id)
+                        freqs.append(count)
+            self._phrases[key] = (doc_ids, freqs, len(self.jobs))
+        return doc_ids, freqs
+
+    def _lengths(self) -> np.ndarray:
+        """Token counts of every job as an array, rebuilt only after jobs were added"""
+        if len(self._length_array) != len(self._doc_lengths):
+            self._length_array = np.array(self._doc_lengths, dtype=np.float64)
+        return self._length_array
+
+    def title_tokens(self, doc_id: int) -> Set[str]:
+        """Return the tokens of a job's title"""
+        return self._title_tokens[doc_id]
+
+    def required_years(self, doc_id: int) -> Optional[int]:
+        """Return the largest years-of-experience figure mentioned in a job"""
+        return self._required_years[doc_id]
+
+    def fingerprint(self, doc_id: int) -> str:
+        """Return the job store fingerprint of a job"""
+        return self._fingerprints[doc_id]
+
+    def fingerprints(self) -> Collection[str]:
+        """Return the fingerprints of every indexed job"""
+        return self._doc_ids.keys()
+
+    def doc_id(self, fingerprint: str) -> Optional[int]:
+        """Return the id of the job with a fingerprint, if it is indexed"""
+        return self._doc_ids.get(fingerprint)
+
+    def job_skills(self, doc_id: int) -> List[str]:
+        """Return the known skills mentioned by a job, if an extractor was given"""
+        if self.skill_extractor is None:
+            return []
+        return self._job_skills[doc_id]
+
+class JobStoreIndex:
+    """A JobIndex over every job in a JobStore, kept in memory and caught up with new postings on use.
+
+    Only postings with a new fingerprint are added. A change to a posting already indexed
+    replaces the job returned in matches and moves its sequence number (so it counts as
+    changed), but the text it is scored on stays as first seen until the index is rebuilt.
+    JobIndex cannot drop documents, so the index is rebuilt whenever the store expires postings.
+    """
+
+    def __init__(self, store: JobStore, skill_extractor: Optional[SkillExtractor] = None):
+        self.store = store
+        self.skill_extractor = skill_extractor
+        # JobIndex caches phrase lookups as it is read, so readers and writers take turns
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.index = JobIndex(skill_extractor=self.skill_extractor)
+        self.seq = 0
+        # Store sequence number of each job's latest change, by doc_id
+        self._doc_seqs: List[int] = []
+        self._deleted = self.store.deleted_count()
+
+    def _refresh(self) -> None:
+        if self.store.deleted_count() != self._deleted:
+            # Expired postings would otherwise still be recommended and still weigh on BM25 statistics
+            self._rebuild()
+        for seq, job in self.store.iter_changes(self.seq):
+            doc_id = self.index.doc_id(job['fingerprint'])
+            if doc_id is None:
+                self.index.add_job(job)
+                self._doc_seqs.append(seq)
+            else:
+                # Matches are copies of this dict, so they show the current url and description
+                self.index.jobs[doc_id] = job
+                self._doc_seqs[doc_id] = seq
+            self.seq = seq
+
+    def match(self, engine: 'MatchingEngine', resume_data: Dict, top_k: int = 5) -> List[Dict]:
+        """Top matches for a resume among all stored jobs"""
+        return self.match_since(engine, resume_data, top_k)[0]
+
+    def match_since(self, engine: 'MatchingEngine', resume_data: Dict, top_k: int = 5,
+                    since_seq: Optional[int] = None, include: Iterable[str] = ()) -> Tuple[List[Dict], int]:
+        """Top matches among jobs added or changed after since_seq (all jobs if None) plus the
+        fingerprints in include, and the seq the result is current up to"""
+        with self._lock:
+            self._refresh()
+            doc_ids = None
+            if since_seq is not None:
+                changed = np.array(self._doc_seqs, dtype=np.int64) > since_seq
+                for fingerprint in include:
+                    doc_id = self.index.doc_id(fingerprint)
+                    if doc_id is not None:
+                        changed[doc_id] = True
+                doc_ids = np.flatnonzero(changed)
+            matches = engine.find_best_matches(resume_data, self.index.jobs, top_k=top_k, index=self.index,
+                                               doc_ids=doc_ids)
+            return matches, self.seq
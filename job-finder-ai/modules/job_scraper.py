@@ -1,177 +1,181 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import time
 import random
-from typing import List, Dict
-from urllib.parse import urlencode, quote_plus
-import streamlit as st
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from . import reporting
+from .html_parsing import get_parser_backend
+from .http_cache import CachingSession, HTTPCache
+from .job_sources import JobSource, get_sources
+from .job_store import JobStore, job_fingerprint
+from .near_duplicates import NearDuplicateDetector
+
+class HostLimiter:
+    """Politeness limits for one host: concurrent requests and spacing between them"""
+    
+    def __init__(self, max_concurrent: int = 1, min_interval: float = 1.0, max_interval: float = 2.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._semaphore = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+    
+    @contextmanager
+    def slot(self):
+        """Hold one of the host's request slots once its spacing interval has passed"""
+        with self._semaphore:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._next_allowed - now
+                self._next_allowed = max(now, self._next_allowed) + random.uniform(self.min_interval, self.max_interval)
+            if delay > 0:
+                time.sleep(delay)
+            yield
 
 class JobScraper:
-    def __init__(self):
+    def __init__(self, sources: Optional[List[JobSource]] = None, max_workers: int = 8,
+                 per_host_concurrency: int = 1, use_cache: bool = True, cache: Optional[HTTPCache] = None,
+                 parser_backend: Optional[str] = None, store: Optional[JobStore] = None,
+                 near_duplicate_threshold: Optional[float] = 0.8,
+                 request_interval: Tuple[float, float] = (1.0, 2.0)):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.session = requests.Session()
+        # Repeated queries are answered from disk instead of the network
+        if use_cache and cache is None:
+            cache = HTTPCache()
+        self.cache = cache
+        self.session = CachingSession(cache) if cache is not None else requests.Session()
         self.session.headers.update(self.headers)
+        # Let every worker keep its own pooled connection
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.sources = sources if sources is not None else get_sources()
+        self.parser = get_parser_backend(parser_backend)
+        # Scraped pages are upserted here as they arrive so later searches can match against them
+        self.store = store
+        # Same posting syndicated with slightly different wording; None keeps exact dedup only
+        self.near_duplicate_threshold = near_duplicate_threshold
+        # Global concurrency budget shared by every source and page
+        self.max_workers = max_workers
+        self.per_host_concurrency = per_host_concurrency
+        # Random (min, max) seconds between requests to one host
+        self.request_interval = request_interval
+        self._host_limiters: Dict[str, HostLimiter] = {}
+        self._limiters_lock = threading.Lock()
     
     def search_jobs(self, skills: List[str], location: str = "Remote", 
                    job_type: str = "Full-time", max_jobs: int = 50) -> List[Dict]:
         """Search for jobs across multiple platforms"""
         all_jobs = []
         
-        # Create search query from skills
-        query = " ".join(skills[:5])  # Use top 5 skills
-        
         try:
-            # Search Indeed
-            indeed_jobs = self._search_indeed(query, location, max_jobs//2)
-            all_jobs.extend(indeed_jobs)
-            
-            # Search SimplyHired (as backup)
-            simplyhired_jobs = self._search_simplyhired(query, location, max_jobs//2)
-            all_jobs.extend(simplyhired_jobs)
-            
-            # Remove duplicates based on title and company
-            unique_jobs = self._remove_duplicates(all_jobs)
+            for _, source_jobs in self.stream_jobs(skills, location, job_type, max_jobs):
+                all_jobs.extend(source_jobs)
             
-            st.info(f"Scraped {len(unique_jobs)} unique jobs from multiple sources")
-            return unique_jobs[:max_jobs]
+            reporting.info(f"Scraped {len(all_jobs)} unique jobs from multiple sources")
+            return all_jobs
             
         except Exception as e:
-            st.warning(f"Job scraping encountered issues: {str(e)}")
+            reporting.warning(f"Job scraping encountered issues: {str(e)}")
             # Return sample jobs as fallback
             return self._get_sample_jobs(skills, location)
     
-    def _search_indeed(self, query: str, location: str, max_jobs: int) -> List[Dict]:
-        """Search Indeed for jobs"""
-        jobs = []
+    def stream_jobs(self, skills: List[str], location: str = "Remote",
+                    job_type: str = "Full-time", max_jobs: int = 50) -> Iterator[Tuple[str, List[Dict]]]:
+        """Crawl result pages of all sources concurrently and yield (source, new unique jobs) per page"""
+        if not self.sources:
+            return
+        
+        # Create search query from skills
+        query = " ".join(skills[:5])  # Use top 5 skills
+        per_source = max(max_jobs // len(self.sources), 1)
+        collected = {source.name: 0 for source in self.sources}
         
+        seen = set()
+        near_duplicates = None
+        if self.near_duplicate_threshold is not None:
+            near_duplicates = NearDuplicateDetector(self.near_duplicate_threshold)
+        total = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
         try:
-            # Build Indeed search URL
-            params = {
-                'q': query,
-                'l': location,
-                'sort': 'date',
-                'limit': min(max_jobs, 50)
+            # Probe the first page of every source, then fan out over the rest
+            pending = {
+                executor.submit(self._fetch_page, source, query, location, 0): (source, 0)
+                for source in self.sources
             }
-            url = f"https://www.indeed.com/jobs?{urlencode(params)}"
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job cards
-            job_cards = soup.find_all('div', class_='job_seen_beacon')
-            
-            for card in job_cards[:max_jobs]:
-                try:
-                    # Extract job information
-                    title_elem = card.find('h2', class_='jobTitle')
-                    title = title_elem.get_text(strip=True) if title_elem else "N/A"
-                    
-                    company_elem = card.find('span', class_='companyName')
-                    company = company_elem.get_text(strip=True) if company_elem else "N/A"
-                    
-                    location_elem = card.find('div', class_='companyLocation')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, page = pending.pop(future)
+                    try:
+                        page_jobs = future.result()
+                    except Exception as e:
+                        # Reported here so Streamlit calls stay on the caller's thread
+                        reporting.warning(f"{source.name} page {page + 1} failed: {str(e)}")
+                        page_jobs = []
                     
-                    # Get job URL
-                    link_elem = title_elem.find('a') if title_elem else None
-                    job_url = f"https://www.indeed.com{link_elem['href']}" if link_elem and link_elem.get('href') else "#"
+                    if page == 0 and len(page_jobs) >= source.page_size:
+                        pages = min(-(-per_source // source.page_size), source.max_pages)
+                        for next_page in range(1, pages):
+                            future = executor.submit(self._fetch_page, source, query, location, next_page)
+                            pending[future] = (source, next_page)
                     
-                    # Extract description snippet
-                    desc_elem = card.find('div', class_='summary')
-                    description = desc_elem.get_text(strip=True) if desc_elem else ""
+                    # Remove duplicates across sources and pages
+                    quota = min(per_source - collected[source.name], max_jobs - total)
+                    unique_jobs = self._remove_duplicates(page_jobs, seen, near_duplicates)[:max(quota, 0)]
+                    if self.store is not None and unique_jobs:
+                        self.store.upsert(unique_jobs)
+                    collected[source.name] += len(unique_jobs)
+                    total += len(unique_jobs)
+                    yield source.name, unique_jobs
                     
-                    jobs.append({
-                        'title': title,
-                        'company': company,
-                        'location': job_location,
-                        'url': job_url,
-                        'description': description,
-                        'source': 'Indeed',
-                        'job_type': 'Full-time',  # Default
-                        'posted_date': 'Recently'
-                    })
-                    
-                except Exception as e:
-                    continue
-            
-            # Add delay to be respectful
-            time.sleep(random.uniform(1, 2))
-            
-        except Exception as e:
-            st.warning(f"Indeed scraping failed: {str(e)}")
-        
-        return jobs
+                    if total >= max_jobs:
+                        return
+        finally:
+            # Don't let slow pages hold up a caller that is already done
+            executor.shutdown(wait=False, cancel_futures=True)
     
-    def _search_simplyhired(self, query: str, location: str, max_jobs: int) -> List[Dict]:
-        """Search SimplyHired for jobs (alternative source)"""
-        jobs = []
-        
-        try:
-            # Build SimplyHired URL
-            params = {
-                'q': query,
-                'l': location,
-                'job': max_jobs
-            }
-            url = f"https://www.simplyhired.com/search?{urlencode(params)}"
-            
+    def _fetch_page(self, source: JobSource, query: str, location: str, page: int) -> List[Dict]:
+        """Download and parse one result page within the host's politeness limits"""
+        url = source.build_url(query, location, page)
+        # Fresh cache hits skip the politeness delay since they never reach the host
+        if self.cache is not None and self.cache.is_fresh(url):
+            limiter = nullcontext()
+        else:
+            limiter = self._host_limiter(source.host).slot()
+        with limiter:
             response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job listings
-            job_cards = soup.find_all('div', class_='SerpJob-jobCard')
-            
-            for card in job_cards[:max_jobs]:
-                try:
-                    title_elem = card.find('a', class_='SerpJob-titleLink')
-                    title = title_elem.get_text(strip=True) if title_elem else "N/A"
-                    
-                    company_elem = card.find('span', class_='SerpJob-companyName')
-                    company = company_elem.get_text(strip=True) if company_elem else "N/A"
-                    
-                    location_elem = card.find('span', class_='SerpJob-location')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    job_url = title_elem['href'] if title_elem and title_elem.get('href') else "#"
-                    
-                    jobs.append({
-                        'title': title,
-                        'company': company,
-                        'location': job_location,
-                        'url': job_url,
-                        'description': "",
-                        'source': 'SimplyHired',
-                        'job_type': 'Full-time',
-                        'posted_date': 'Recently'
-                    })
-                    
-                except Exception as e:
-                    continue
-            
-            time.sleep(random.uniform(1, 2))
-            
-        except Exception as e:
-            st.warning(f"SimplyHired scraping failed: {str(e)}")
-        
-        return jobs
+        response.raise_for_status()
+        return source.parse(response.content, location, self.parser)
     
-    def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
-        seen = set()
+    def _host_limiter(self, host: str) -> HostLimiter:
+        """Return the shared limiter for a host, creating it on first use"""
+        with self._limiters_lock:
+            if host not in self._host_limiters:
+                self._host_limiters[host] = HostLimiter(self.per_host_concurrency, *self.request_interval)
+            return self._host_limiters[host]
+    
+    def _remove_duplicates(self, jobs: List[Dict], seen: set = None,
+                           near_duplicates: Optional[NearDuplicateDetector] = None) -> List[Dict]:
+        """Remove duplicate jobs based on their normalized title, company and location, then near-duplicates"""
+        if seen is None:
+            seen = set()
         unique_jobs = []
         
         for job in jobs:
-            identifier = f"{job['title'].lower()}_{job['company'].lower()}"
-            if identifier not in seen:
-                seen.add(identifier)
+            job['fingerprint'] = job_fingerprint(job)
+            if job['fingerprint'] not in seen:
+                seen.add(job['fingerprint'])
                 unique_jobs.append(job)
         
+        if near_duplicates is not None:
+            unique_jobs = near_duplicates.filter(unique_jobs)
         return unique_jobs
     
     def _get_sample_jobs(self, skills: List[str], location: str) -> List[Dict]:
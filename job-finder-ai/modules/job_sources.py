@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Type
+from urllib.parse import urlencode, urlparse
+from .html_parsing import CardSpec, get_parser_backend
+
+SOURCE_REGISTRY: Dict[str, Type['JobSource']] = {}
+
+def register_source(source_class: Type['JobSource']) -> Type['JobSource']:
+    """Class decorator that makes a job source available to JobScraper"""
+    SOURCE_REGISTRY[source_class.name] = source_class
+    return source_class
+
+def get_sources(names: Optional[List[str]] = None) -> List['JobSource']:
+    """Instantiate the registered sources, optionally restricted to the given names"""
+    if names is None:
+        names = list(SOURCE_REGISTRY)
+    return [SOURCE_REGISTRY[name]() for name in names]
+
+class JobSource:
+    """A job board that can be searched one result page at a time"""
+
+    name = ""
+    base_url = ""
+    page_size = 10
+    max_pages = 10
+    card_spec: CardSpec = None
+
+    def __init__(self, base_url: Optional[str] = None):
+        # Overridable so a source can be pointed at a mirror or a local stand-in server
+        if base_url is not None:
+            self.base_url = base_url
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.base_url).netloc
+
+    def build_url(self, query: str, location: str, page: int) -> str:
+        """Return the search URL for a zero-based result page"""
+        raise NotImplementedError
+
+    def parse(self, content: bytes, location: str, backend=None) -> List[Dict]:
+        """Extract job dicts from a search result page"""
+        if backend is None:
+            backend = get_parser_backend()
+        jobs = []
+        for card in backend.extract(content, self.card_spec):
+            try:
+                jobs.append(self.build_job(card, location))
+            except Exception:
+                continue
+        return jobs
+
+    def build_job(self, card: Dict[str, Optional[str]], location: str) -> Dict:
+        """Turn the raw field values of one card into a job dict"""
+        raise NotImplementedError
+
+@register_source
+class IndeedSource(JobSource):
+    name = "Indeed"
+    base_url = "https://www.indeed.com"
+    page_size = 10
+    card_spec = CardSpec(
+        card=('div', 'job_seen_beacon'),
+        fields={
+            'title': [('h2', 'jobTitle')],
+            'company': [('span', 'companyName')],
+            'location': [('div', 'companyLocation')],
+            'description': [('div', 'summary')],
+        },
+        links={'url': [('h2', 'jobTitle'), ('a', None)]}
+    )
+
+    def build_url(self, query: str, location: str, page: int) -> str:
+        params = {
+            'q': query,
+            'l': location,
+            'sort': 'date',
+            'start': page * self.page_size
+        }
+        return f"{self.base_url}/jobs?{urlencode(params)}"
+
+    def build_job(self, card: Dict[str, Optional[str]], location: str) -> Dict:
+        return {
+            'title': card['title'] or "N/A",
+            'company': card['company'] or "N/A",
+            'location': card['location'] or location,
+            'url': f"{self.base_url}{card['url']}" if card['url'] else "#",
+            'description': card['description'] or "",
+            'source': self.name,
+            'job_type': 'Full-time',  # Default
+            'posted_date': 'Recently'
+        }
+
+@register_source
+class SimplyHiredSource(JobSource):
+    name = "SimplyHired"
+    base_url = "https://www.simplyhired.com"
+    page_size = 20
+    card_spec = CardSpec(
+        card=('div', 'SerpJob-jobCard'),
+        fields={
+            'title': [('a', 'SerpJob-titleLink')],
+            'company': [('span', 'SerpJob-companyName')],
+            'location': [('span', 'SerpJob-location')],
+        },
+        links={'url': [('a', 'SerpJob-titleLink')]}
+    )
+
+    def build_url(self, query: str, location: str, page: int) -> str:
+        params = {
+            'q': query,
+            'l': location,
+            'pn': page + 1
+        }
+        return f"{self.base_url}/search?{urlencode(params)}"
+
+    def build_job(self, card: Dict[str, Optional[str]], location: str) -> Dict:
+        return {
+            'title': card['title'] or "N/A",
+            'company': card['company'] or "N/A",
+            'location': card['location'] or location,
+            'url': card['url'] or "#",
+            'description': "",
+            'source': self.name,
+            'job_type': 'Full-time',
+            'posted_date': 'Recently'
+        }
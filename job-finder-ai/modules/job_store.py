@@ -0,0 +1,214 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from .utils import normalize_url, tokenize
+
+# Legal-form suffixes that differ between boards for the same employer
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'gmbh', 'plc', 'limited'}
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'refid', 'trk', 'from'}
+
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+SQLITE_MAX_PARAMS = 500
+
+def canonical_url(url: str) -> str:
+    """normalize_url without tracking parameters, so re-shared links to a posting compare equal"""
+    if not url or not url.lower().startswith('http'):
+        return ''
+    parts = urlsplit(normalize_url(url))
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key not in TRACKING_PARAMS and not key.startswith('utm_')]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+def job_fingerprint(job: Dict) -> str:
+    """Stable id from the normalized title, company and location of a posting"""
+    title = " ".join(tokenize(job.get('title', '')))
+    company_tokens = tokenize(job.get('company', ''))
+    while company_tokens and company_tokens[-1] in COMPANY_SUFFIXES:
+        company_tokens.pop()
+    location = " ".join(tokenize(job.get('location', '')))
+    key = "\x1f".join((title, " ".join(company_tokens), location))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+class JobStore:
+    """SQLite corpus of scraped jobs, deduplicated by fingerprint and kept across searches.
+
+    Every insert or content change takes the next value of a store-wide sequence number,
+    so callers can ask for everything that changed since a sequence they have seen. The
+    counter lives in its own table and never goes back, even when expire() deletes the
+    postings that last took it.
+    """
+
+    def __init__(self, path: str = 'cache/jobs.sqlite3'):
+        self.path = path
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly so an upsert batch commits once
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                fingerprint TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                source TEXT,
+                data TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_seq ON jobs (seq)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (last_seen)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        # Stores created before the counter existed continue from their highest sequence number
+        self._conn.execute(
+            "INSERT OR IGNORE INTO store_meta (key, value) SELECT 'seq', COALESCE(MAX(seq), 0) FROM jobs"
+        )
+        self._conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('deleted', 0)")
+
+    def upsert(self, jobs: Iterable[Dict]) -> Dict[str, int]:
+        """Insert new postings and refresh known ones; sets 'fingerprint' on each job"""
+        batch = {}
+        for job in jobs:
+            job['fingerprint'] = job_fingerprint(job)
+            batch[job['fingerprint']] = job
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if not batch:
+            return stats
+
+        now = time.time()
+        fingerprints = list(batch)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                existing = {}
+                for start in range(0, len(fingerprints), SQLITE_MAX_PARAMS):
+                    chunk = fingerprints[start:start + SQLITE_MAX_PARAMS]
+                    existing.update(self._conn.execute(
+                        f"SELECT fingerprint, data FROM jobs WHERE fingerprint IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    ))
+                seq = self._conn.execute("SELECT value FROM store_meta WHERE key = 'seq'").fetchone()[0]
+
+                changed, unchanged = [], []
+                for fingerprint, job in batch.items():
+                    data = json.dumps(job, ensure_ascii=False, sort_keys=True)
+                    if existing.get(fingerprint) == data:
+                        unchanged.append((now, fingerprint))
+                        continue
+                    stats['updated' if fingerprint in existing else 'inserted'] += 1
+                    seq += 1
+                    changed.append((fingerprint, canonical_url(job.get('url', '')), job.get('source'),
+                                    data, seq, now, now))
+                stats['unchanged'] = len(unchanged)
+
+                self._conn.executemany('''
+                    INSERT INTO jobs (fingerprint, url, source, data, seq, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (fingerprint) DO UPDATE SET
+                        url = excluded.url, source = excluded.source, data = excluded.data,
+                        seq = excluded.seq, last_seen = excluded.last_seen
+                ''', changed)
+                # Seeing a posting again keeps it from expiring without counting as a change
+                self._conn.executemany('UPDATE jobs SET last_seen = ? WHERE fingerprint = ?', unchanged)
+                self._conn.execute("UPDATE store_meta SET value = ? WHERE key = 'seq'", (seq,))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return stats
+
+    def get(self, fingerprint: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM jobs WHERE fingerprint = ?', (fingerprint,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_by_url(self, url: str) -> Optional[Dict]:
+        """The posting stored under a URL, ignoring tracking parameters and other cosmetic differences"""
+        url = canonical_url(url)
+        if not url:
+            # Postings without a usable URL are all stored under ''
+            return None
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM jobs WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def seqs(self, fingerprints: Iterable[str]) -> Dict[str, int]:
+        """Sequence number of the latest change of each stored posting among fingerprints"""
+        fingerprints = list(fingerprints)
+        result = {}
+        with self._lock:
+            for start in range(0, len(fingerprints), SQLITE_MAX_PARAMS):
+                chunk = fingerprints[start:start + SQLITE_MAX_PARAMS]
+                result.update(self._conn.execute(
+                    f"SELECT fingerprint, seq FROM jobs WHERE fingerprint IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ))
+        return result
+
+    def iter_changes(self, since_seq: int = 0, batch_size: int = 5000) -> Iterator[Tuple[int, Dict]]:
+        """Yield (seq, posting) for postings inserted or changed after since_seq, oldest change first"""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT seq, data FROM jobs WHERE seq > ? ORDER BY seq LIMIT ?', (since_seq, batch_size)
+                ).fetchall()
+            for seq, data in rows:
+                yield seq, json.loads(data)
+            if len(rows) < batch_size:
+                return
+            since_seq = rows[-1][0]
+
+    def iter_jobs(self, since_seq: int = 0, batch_size: int = 5000) -> Iterator[Dict]:
+        """Yield postings inserted or changed after since_seq, oldest change first"""
+        for _, job in self.iter_changes(since_seq, batch_size):
+            yield job
+
+    def jobs(self, since_seq: int = 0) -> List[Dict]:
+        return list(self.iter_jobs(since_seq))
+
+    def max_seq(self) -> int:
+        """The last sequence number handed out, whether or not its posting still exists"""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM store_meta WHERE key = 'seq'").fetchone()[0]
+
+    def deleted_count(self) -> int:
+        """Postings expired over the store's lifetime; a change tells in-memory copies to rebuild"""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM store_meta WHERE key = 'deleted'").fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def expire(self, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """Delete postings no search has returned for max_age seconds"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                deleted = self._conn.execute(
+                    'DELETE FROM jobs WHERE last_seen < ?', (time.time() - max_age,)
+                ).rowcount
+                self._conn.execute("UPDATE store_meta SET value = value + ? WHERE key = 'deleted'", (deleted,))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return deleted
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Process-wide job store; stale postings are dropped when it is first opened"""
+    store = JobStore()
+    store.expire()
+    return store
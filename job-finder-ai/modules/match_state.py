@@ -0,0 +1,148 @@
+"""Incremental matching for returning subscribers.
+
+Each subscriber's state holds a key of their resume, the job store sequence number
+their matches are current up to, and their top-k as (score, fingerprint). A run only
+scores jobs added or changed since that watermark, merges them into the top-k and
+reports the jobs that entered it. Resumes that changed, and top-k lists holding a job
+that has since expired or changed, are rescored against the whole store.
+
+Usage: python -m modules.match_state RESUMES.jsonl -o new_matches.jsonl [--top-k 5]
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .batch_match import MATCH_FIELDS
+from .job_index import JobStoreIndex
+from .job_store import JobStore, get_job_store
+from .matching_engine import MatchingEngine
+
+def resume_key(resume_data: Dict, top_k: int) -> str:
+    """Digest of everything matching depends on, so a changed resume (or k) forces a rescore"""
+    key = json.dumps([sorted(resume_data.get('skills', [])), resume_data.get('experience_level'),
+                      sorted(resume_data.get('job_titles', [])), top_k], ensure_ascii=False)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+class MatchStateStore:
+    """SQLite table of each subscriber's resume key, corpus watermark and current top-k"""
+
+    def __init__(self, path: str = 'cache/match_state.sqlite3'):
+        self.path = path
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS match_state (
+                user_id TEXT PRIMARY KEY,
+                resume_key TEXT NOT NULL,
+                watermark INTEGER NOT NULL,
+                top_matches TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT resume_key, watermark, top_matches FROM match_state WHERE user_id = ?', (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'resume_key': row[0], 'watermark': row[1],
+                'top_matches': [tuple(entry) for entry in json.loads(row[2])]}
+
+    def put(self, user_id: str, resume_key: str, watermark: int, top_matches: List[Tuple[float, str]]) -> None:
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO match_state (user_id, resume_key, watermark, top_matches, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    resume_key = excluded.resume_key, watermark = excluded.watermark,
+                    top_matches = excluded.top_matches, updated_at = excluded.updated_at
+            ''', (user_id, resume_key, watermark, json.dumps(top_matches), time.time()))
+            self._conn.commit()
+
+    def delete(self, user_id: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM match_state WHERE user_id = ?', (user_id,))
+            self._conn.commit()
+
+class IncrementalMatcher:
+    """Keeps subscribers' top-k current by scoring only the jobs that changed since their last run.
+
+    BM25 weights drift as the store grows, so a job just outside someone's top-k can
+    overtake one inside it without changing; that is only noticed at the next full rescore.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, state: Optional[MatchStateStore] = None,
+                 engine: Optional[MatchingEngine] = None, top_k: int = 5):
+        self.store = store if store is not None else get_job_store()
+        self.state = state if state is not None else MatchStateStore()
+        self.engine = engine if engine is not None else MatchingEngine()
+        self.top_k = top_k
+        self.index = JobStoreIndex(self.store)
+        self.stats = {'incremental': 0, 'full': 0}
+
+    def update(self, user_id: str, resume_data: Dict) -> List[Dict]:
+        """Bring a subscriber's top-k up to date and return the matches new to it, best first"""
+        key = resume_key(resume_data, self.top_k)
+        previous = self.state.get(user_id)
+        since_seq = None
+        kept: List[str] = []
+        if previous is not None and previous['resume_key'] == key:
+            kept = [fingerprint for _, fingerprint in previous['top_matches']]
+            seqs = self.store.seqs(kept)
+            # A kept job that expired or changed may leave the top-k, and only a full rescore finds its successor
+            if len(seqs) == len(kept) and all(seq <= previous['watermark'] for seq in seqs.values()):
+                since_seq = previous['watermark']
+            else:
+                kept = []
+        self.stats['full' if since_seq is None else 'incremental'] += 1
+
+        # The kept top-k is rescored along with the new jobs (k more jobs to score), so every
+        # score in the merged top-k uses today's corpus statistics
+        matches, watermark = self.index.match_since(self.engine, resume_data, self.top_k, since_seq, kept)
+        top = [(match['match_score'], match['fingerprint']) for match in matches]
+
+        self.state.put(user_id, key, watermark, top)
+        previous_top = {fingerprint for _, fingerprint in previous['top_matches']} if previous else set()
+        return [match for match in matches if match['fingerprint'] not in previous_top]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report new top matches for returning subscribers")
+    parser.add_argument('resumes', help="JSONL of parsed resumes, as written by modules.bulk_ingest")
+    parser.add_argument('-o', '--output', required=True, help="JSONL file to write each resume's new matches to")
+    parser.add_argument('-k', '--top-k', type=int, default=5, help="matches to keep per resume")
+    parser.add_argument('--state', default='cache/match_state.sqlite3', help="match state database")
+    args = parser.parse_args(argv)
+
+    matcher = IncrementalMatcher(state=MatchStateStore(args.state), top_k=args.top_k)
+    start = time.perf_counter()
+    resumes = notified = 0
+    with open(args.resumes, 'r', encoding='utf-8') as file, open(args.output, 'w', encoding='utf-8') as out:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            resume_data = json.loads(line)
+            user_id = str(resume_data.get('source_file', number))
+            new_matches = matcher.update(user_id, resume_data)
+            resumes += 1
+            if new_matches:
+                notified += 1
+                matches = [{field: match[field] for field in MATCH_FIELDS if field in match} for match in new_matches]
+                out.write(json.dumps({'resume': user_id, 'matches': matches}, ensure_ascii=False) + '\n')
+
+    print(f"Updated {resumes} resumes against {len(matcher.index.index)} jobs in "
+          f"{time.perf_counter() - start:.2f}s ({matcher.stats['incremental']} incremental, "
+          f"{matcher.stats['full']} full); {notified} have new matches", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
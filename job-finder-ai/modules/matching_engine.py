@@ -1,94 +1,306 @@
-from typing import Dict, List
-import re
-from collections import Counter
-import streamlit as st
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .job_index import JobIndex
+from .semantic_index import SemanticJobIndex
+from .skill_extractor import SkillExtractor
+from .utils import tokenize
+
+EXPERIENCE_KEYWORDS = {
+    'Entry Level': ['entry', 'junior', 'graduate', 'intern', 'trainee', 'associate'],
+    'Mid Level': ['mid', 'intermediate', 'experienced', 'professional'],
+    'Senior Level': ['senior', 'lead', 'principal', 'architect', 'manager', 'director']
+}
 
 class MatchingEngine:
-    def __init__(self):
-        self.skill_weights = {
-            'exact_match': 1.0,
-            'partial_match': 0.7,
-            'related_match': 0.5
+    def __init__(self, skill_extractor: Optional[SkillExtractor] = None,
+                 semantic_index: Optional[SemanticJobIndex] = None, shortlist_size: int = 100):
+        self.skill_extractor = skill_extractor
+        # When set, candidates come from embedding similarity and the rules below only rerank them
+        self.semantic_index = semantic_index
+        self.shortlist_size = shortlist_size
+        self.score_weights = {
+            'skills': 0.7,
+            'experience': 0.2,
+            'title': 0.1
         }
     
-    def find_best_matches(self, resume_data: Dict, jobs: List[Dict], top_k: int = 5) -> List[Dict]:
-        """Find the best job matches for the resume"""
+    def find_best_matches(self, resume_data: Dict, jobs: List[Dict], top_k: int = 5,
+                          index: Optional[JobIndex] = None, doc_ids: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Find the best job matches for the resume, optionally among only some of the indexed jobs"""
+        
+        if index is None:
+            index = JobIndex(jobs, self.skill_extractor)
         
-        scored_jobs = []
-        user_skills = [skill.lower() for skill in resume_data['skills']]
+        user_skills = [(skill.lower(), tokenize(skill)) for skill in resume_data['skills']]
         user_experience = resume_data['experience_level']
         
-        for job in jobs:
-            score = self._calculate_match_score(job, user_skills, user_experience)
-            job_with_score = job.copy()
-            job_with_score['match_score'] = score
-            job_with_score['skills_match'] = self._find_matching_skills(job, user_skills)
-            scored_jobs.append(job_with_score)
+        skills_scores = self._calculate_skills_scores(index, user_skills)
+        if self.semantic_index is not None:
+            similarities = self._semantic_shortlist(index, resume_data, doc_ids)
+            candidates = np.array(list(similarities), dtype=np.int64)
+        elif doc_ids is not None:
+            similarities = {}
+            doc_ids = np.asarray(doc_ids, dtype=np.int64)
+            candidates = doc_ids[skills_scores[doc_ids] > 0]
+        else:
+            # Only jobs mentioning at least one of the user's skills can match
+            similarities = {}
+            candidates = np.flatnonzero(skills_scores > 0)
+        if top_k <= 0 or not len(candidates):
+            return []
+        
+        # Experience and title score at most 1, so the skills score alone bounds what a job can reach
+        weights = self.score_weights
+        bounds = np.minimum(skills_scores[candidates] * weights['skills'] + weights['experience'] +
+                            weights['title'], 1.0)
+        
+        # Min-heap of the best (score, similarity, -doc_id) so far; ties go to the earlier job
+        top: List[Tuple[float, float, int]] = []
+        for position in np.argsort(-bounds, kind='stable'):
+            if len(top) == top_k and bounds[position] < top[0][0]:
+                # Candidates come in bound order, so none of the rest can make the top k
+                break
+            doc_id = int(candidates[position])
+            score = self._calculate_match_score(index, doc_id, float(skills_scores[doc_id]),
+                                                user_skills, user_experience)
+            entry = (score, similarities.get(doc_id, 0.0), -doc_id)
+            if len(top) < top_k:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+        
+        # Only the jobs that made it are copied
+        matches = []
+        for score, similarity, negative_id in sorted(top, reverse=True):
+            match = self._build_match(index, -negative_id, score, user_skills)
+            if -negative_id in similarities:
+                match['semantic_score'] = similarity
+            matches.append(match)
+        return matches
+    
+    def _semantic_shortlist(self, index: JobIndex, resume_data: Dict,
+                            doc_ids: Optional[Sequence[int]] = None) -> Dict[int, float]:
+        """Map doc_id -> similarity for the jobs closest to the resume in embedding space"""
+        # Postings already embedded are skipped, so each one is only encoded the first time it is seen
+        self.semantic_index.add_jobs(index.jobs)
+        if doc_ids is None:
+            restrict_to = index.fingerprints()
+        else:
+            restrict_to = {index.fingerprint(int(doc_id)) for doc_id in doc_ids}
+        shortlist = self.semantic_index.search(resume_data, self.shortlist_size, restrict_to=restrict_to)
+        return {index.doc_id(fingerprint): similarity for fingerprint, similarity in shortlist}
+    
+    def find_best_matches_batch(self, resumes: List[Dict], jobs: List[Dict], top_k: int = 5,
+                                index: Optional[JobIndex] = None, resume_chunk_size: int = 256,
+                                job_chunk_size: int = 2048) -> List[List[Dict]]:
+        """Find the best job matches for many resumes at once using matrix operations"""
+        
+        if index is None:
+            index = JobIndex(jobs, self.skill_extractor)
+        if not resumes:
+            return []
+        if not len(index) or top_k <= 0:
+            return [[] for _ in resumes]
+        
+        # Column per distinct skill across all resumes
+        vocabulary: Dict[str, int] = {}
+        resume_skills = []
+        for resume_data in resumes:
+            user_skills = [(skill.lower(), tokenize(skill)) for skill in resume_data['skills']]
+            for skill, _ in user_skills:
+                vocabulary.setdefault(skill, len(vocabulary))
+            resume_skills.append(user_skills)
+        
+        skill_entries, title_entries, idf = self._encode_job_skills(index, resume_skills, vocabulary)
+        experience_table, level_rows = self._encode_job_experience(index)
+        weights = self.score_weights
+        
+        results = []
+        for start in range(0, len(resumes), resume_chunk_size):
+            chunk_skills = resume_skills[start:start + resume_chunk_size]
+            
+            # Skill-count matrix (resumes x skills); duplicates count twice like the per-job loop
+            resume_matrix = np.zeros((len(chunk_skills), len(vocabulary)))
+            for row, user_skills in enumerate(chunk_skills):
+                for skill, _ in user_skills:
+                    resume_matrix[row, vocabulary[skill]] += 1
+            skill_counts = resume_matrix.sum(axis=1)[:, None]
+            safe_counts = np.maximum(skill_counts, 1)
+            weighted_matrix = resume_matrix * idf
+            safe_weights = np.maximum(weighted_matrix.sum(axis=1)[:, None], 1e-12)
+            levels = np.array([level_rows.get(resume_data['experience_level'], len(EXPERIENCE_KEYWORDS))
+                               for resume_data in resumes[start:start + resume_chunk_size]])
+            
+            best_scores = np.full((len(chunk_skills), 0), -np.inf)
+            best_ids = np.zeros((len(chunk_skills), 0), dtype=np.int64)
+            
+            for job_start in range(0, len(index), job_chunk_size):
+                job_end = min(job_start + job_chunk_size, len(index))
+                skill_matrix = self._dense_block(skill_entries, len(vocabulary), job_start, job_end)
+                title_matrix = self._dense_block(title_entries, len(vocabulary), job_start, job_end)
+                
+                skill_hits = weighted_matrix @ skill_matrix
+                skills_score = np.where(skill_counts > 0, np.minimum(skill_hits / safe_weights, 1.0), 0.0)
+                title_score = np.where(skill_counts > 0,
+                                       np.minimum((resume_matrix @ title_matrix) / safe_counts, 1.0), 0.5)
+                experience_score = experience_table[levels, job_start:job_end]
+                
+                scores = np.minimum(skills_score * weights['skills'] +
+                                    experience_score * weights['experience'] +
+                                    title_score * weights['title'], 1.0)
+                # Same candidate rule as find_best_matches: at least one skill must be mentioned
+                scores[skill_hits <= 0] = -np.inf
+                
+                block_ids = np.broadcast_to(np.arange(job_start, job_end), scores.shape)
+                best_scores, best_ids = self._merge_top_k(
+                    np.hstack([best_scores, scores]), np.hstack([best_ids, block_ids]), top_k)
+            
+            for row, user_skills in enumerate(chunk_skills):
+                order = np.lexsort((best_ids[row], -best_scores[row]))
+                matches = [self._build_match(index, int(best_ids[row, col]), float(best_scores[row, col]), user_skills)
+                           for col in order if np.isfinite(best_scores[row, col])]
+                results.append(matches)
+        
+        return results
+    
+    def _encode_job_skills(self, index: JobIndex, resume_skills: List[List[Tuple[str, List[str]]]],
+                           vocabulary: Dict[str, int]) -> Tuple[Tuple, Tuple, np.ndarray]:
+        """Encode skill and title hits as sparse (skill, job, value) triplets, plus the idf of each skill"""
+        skill_tokens = {}
+        for user_skills in resume_skills:
+            for skill, tokens in user_skills:
+                skill_tokens.setdefault(skill, tokens)
+        
+        skill_rows, skill_cols, skill_values = [], [], []
+        title_rows, title_cols = [], []
+        idf = np.zeros(len(vocabulary))
+        for skill, tokens in skill_tokens.items():
+            column = vocabulary[skill]
+            doc_ids, tf_weights = index.bm25_tf(tokens)
+            # Skills no job mentions carry no weight, as in _calculate_skills_scores
+            idf[column] = index.idf(tokens) if len(doc_ids) else 0.0
+            skill_rows.append(np.full(len(doc_ids), column, dtype=np.int64))
+            skill_cols.append(doc_ids)
+            skill_values.append(np.minimum(tf_weights, 1.0))
+            
+            for doc_id in index.candidates(tokens):
+                if any(word in index.title_tokens(doc_id) for word in tokens):
+                    title_rows.append(column)
+                    title_cols.append(doc_id)
+        
+        skill_entries = (np.concatenate(skill_rows or [np.zeros(0, dtype=np.int64)]),
+                         np.concatenate(skill_cols or [np.zeros(0, dtype=np.int64)]),
+                         np.concatenate(skill_values or [np.zeros(0)]))
+        title_entries = (np.array(title_rows, dtype=np.int64), np.array(title_cols, dtype=np.int64),
+                         np.ones(len(title_rows)))
+        return skill_entries, title_entries, idf
+    
+    def _encode_job_experience(self, index: JobIndex) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Precompute the experience score of every job for every experience level"""
+        level_rows = {level: row for row, level in enumerate(EXPERIENCE_KEYWORDS)}
+        # Extra last row for levels without keywords, which always score neutral
+        table = np.full((len(level_rows) + 1, len(index)), 0.5)
+        for level, row in level_rows.items():
+            for doc_id in range(len(index)):
+                table[row, doc_id] = self._calculate_experience_score(index, doc_id, level)
+        return table, level_rows
+    
+    @staticmethod
+    def _dense_block(entries: Tuple, n_skills: int, job_start: int, job_end: int) -> np.ndarray:
+        """Materialize the (skills x jobs) block for jobs in [job_start, job_end)"""
+        rows, cols, values = entries
+        block = np.zeros((n_skills, job_end - job_start))
+        selected = (cols >= job_start) & (cols < job_end)
+        block[rows[selected], cols[selected] - job_start] = values[selected]
+        return block
+    
+    @staticmethod
+    def _merge_top_k(scores: np.ndarray, ids: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep the top_k columns of every row using argpartition; jobs tied at the cutoff
+        go to the earlier job, as in find_best_matches"""
+        if scores.shape[1] <= top_k:
+            return scores, ids
+        keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        cutoff = np.take_along_axis(scores, keep, axis=1).min(axis=1, keepdims=True)
         
-        # Sort by match score and return top k
-        scored_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-        return scored_jobs[:top_k]
+        # The partition keeps arbitrary jobs among those tied at the cutoff; take the earliest instead
+        above, at = scores > cutoff, scores == cutoff
+        tied = np.flatnonzero(np.isfinite(cutoff[:, 0]) & (above.sum(axis=1) + at.sum(axis=1) > top_k))
+        if len(tied):
+            places = top_k - above[tied].sum(axis=1)
+            tied_ids = np.sort(np.where(at[tied], ids[tied], np.iinfo(ids.dtype).max), axis=1)
+            last_id = tied_ids[np.arange(len(tied)), places - 1]
+            chosen = above[tied] | (at[tied] & (ids[tied] <= last_id[:, None]))
+            keep[tied] = np.nonzero(chosen)[1].reshape(len(tied), top_k)
+        return np.take_along_axis(scores, keep, axis=1), np.take_along_axis(ids, keep, axis=1)
+    
+    def _build_match(self, index: JobIndex, doc_id: int, score: float,
+                     user_skills: List[Tuple[str, List[str]]]) -> Dict:
+        """Copy a job and attach its match details"""
+        job_with_score = index.jobs[doc_id].copy()
+        job_with_score['match_score'] = score
+        job_with_score['skills_match'] = self._find_matching_skills(index, doc_id, user_skills)
+        if index.skill_extractor is not None and 'skills_required' not in job_with_score:
+            job_with_score['skills_required'] = index.job_skills(doc_id)
+        return job_with_score
     
-    def _calculate_match_score(self, job: Dict, user_skills: List[str], user_experience: str) -> float:
+    def _calculate_match_score(self, index: JobIndex, doc_id: int, skills_score: float,
+                               user_skills: List[Tuple[str, List[str]]], user_experience: str) -> float:
         """Calculate match score for a job"""
         total_score = 0.0
         
         # Skills matching (70% weight)
-        skills_score = self._calculate_skills_score(job, user_skills)
-        total_score += skills_score * 0.7
+        total_score += skills_score * self.score_weights['skills']
         
         # Experience level matching (20% weight)
-        experience_score = self._calculate_experience_score(job, user_experience)
-        total_score += experience_score * 0.2
+        experience_score = self._calculate_experience_score(index, doc_id, user_experience)
+        total_score += experience_score * self.score_weights['experience']
         
         # Job title relevance (10% weight)
-        title_score = self._calculate_title_score(job, user_skills)
-        total_score += title_score * 0.1
+        title_score = self._calculate_title_score(index, doc_id, user_skills)
+        total_score += title_score * self.score_weights['title']
         
         return min(total_score, 1.0)  # Cap at 1.0
     
-    def _calculate_skills_score(self, job: Dict, user_skills: List[str]) -> float:
-        """Calculate skills matching score"""
-        if not user_skills:
-            return 0.0
-        
-        job_text = f"{job['title']} {job['description']}".lower()
+    def _calculate_skills_scores(self, index: JobIndex,
+                                 user_skills: List[Tuple[str, List[str]]]) -> np.ndarray:
+        """Calculate the skills matching score of every job at once.
         
-        matched_skills = 0
-        total_user_skills = len(user_skills)
+        Each skill is a BM25 query term (multi-word skills must appear as a phrase),
+        weighted by its idf so rare skills count for more than ones every job lists.
+        Its saturated frequency is capped at one mention in a job of average length,
+        which keeps the score a 0-1 fraction of the resume's skill weight. Skills no job
+        mentions (or with no words at all) are left out of that weight: they would have
+        the highest idf and lower every job's score alike.
+        """
+        scores = np.zeros(len(index))
+        total_weight = 0.0
+        for _, tokens in user_skills:
+            doc_ids, tf_weights = index.bm25_tf(tokens)
+            if not len(doc_ids):
+                continue
+            weight = index.idf(tokens)
+            scores[doc_ids] += weight * np.minimum(tf_weights, 1.0)
+            total_weight += weight
         
-        for skill in user_skills:
-            if skill in job_text:
-                matched_skills += 1
-            elif any(word in job_text for word in skill.split()):
-                matched_skills += 0.7  # Partial match
-        
-        return min(matched_skills / total_user_skills, 1.0)
+        if total_weight:
+            scores /= total_weight
+        return np.minimum(scores, 1.0)
     
-    def _calculate_experience_score(self, job: Dict, user_experience: str) -> float:
+    def _calculate_experience_score(self, index: JobIndex, doc_id: int, user_experience: str) -> float:
         """Calculate experience level matching score"""
-        job_text = f"{job['title']} {job['description']}".lower()
-        
-        experience_mapping = {
-            'Entry Level': ['entry', 'junior', 'graduate', 'intern', 'trainee', 'associate'],
-            'Mid Level': ['mid', 'intermediate', 'experienced', 'professional'],
-            'Senior Level': ['senior', 'lead', 'principal', 'architect', 'manager', 'director']
-        }
-        
-        user_keywords = experience_mapping.get(user_experience, [])
+        user_keywords = EXPERIENCE_KEYWORDS.get(user_experience, [])
         
         # Check for exact experience level matches
         for keyword in user_keywords:
-            if keyword in job_text:
+            if index.has_term(doc_id, keyword):
                 return 1.0
         
         # Check for years of experience
-        years_pattern = r'(\d+)\s*(?:years?|yrs?)'
-        years_matches = re.findall(years_pattern, job_text)
+        required_years = index.required_years(doc_id)
         
-        if years_matches:
-            required_years = max(int(year) for year in years_matches)
-            
+        if required_years is not None:
             if user_experience == 'Entry Level' and required_years <= 2:
                 return 0.9
             elif user_experience == 'Mid Level' and 3 <= required_years <= 7:
@@ -98,17 +310,16 @@ class MatchingEngine:
         
         return 0.5  # Default neutral score
     
-    def _calculate_title_score(self, job: Dict, user_skills: List[str]) -> float:
+    def _calculate_title_score(self, index: JobIndex, doc_id: int,
+                               user_skills: List[Tuple[str, List[str]]]) -> float:
         """Calculate job title relevance score"""
-        job_title = job['title'].lower()
+        title_words = index.title_tokens(doc_id)
         
         # Check if any user skills appear in job title
-        title_words = job_title.split()
         skill_matches = 0
         
-        for skill in user_skills:
-            skill_words = skill.lower().split()
-            if any(word in title_words for word in skill_words):
+        for _, tokens in user_skills:
+            if any(word in title_words for word in tokens):
                 skill_matches += 1
         
         if not user_skills:
@@ -116,15 +327,13 @@ class MatchingEngine:
         
         return min(skill_matches / len(user_skills), 1.0)
     
-    def _find_matching_skills(self, job: Dict, user_skills: List[str]) -> List[str]:
+    def _find_matching_skills(self, index: JobIndex, doc_id: int,
+                              user_skills: List[Tuple[str, List[str]]]) -> List[str]:
         """Find which user skills match the job requirements"""
-        job_text = f"{job['title']} {job['description']}".lower()
         matching_skills = []
         
-        for skill in user_skills:
-            if skill in job_text:
-                matching_skills.append(skill.title())
-            elif any(word in job_text for word in skill.split()):
+        for skill, tokens in user_skills:
+            if index.has_phrase(doc_id, tokens):
                 matching_skills.append(skill.title())
         
-        return matching_skills
\ No newline at end of file
+        return matching_skills
@@ -0,0 +1,90 @@
+import zlib
+from typing import Dict, List, Tuple
+import numpy as np
+from .job_store import COMPANY_SUFFIXES
+from .utils import tokenize
+
+# Spellings boards use interchangeably in titles
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'eng': 'engineer', 'engr': 'engineer',
+    'dev': 'developer', 'admin': 'administrator', 'assoc': 'associate', 'asst': 'assistant'
+}
+
+# A prime just above 2**32: 32-bit hashes times 32-bit coefficients still fit in uint64
+MERSENNE_PRIME = np.uint64(4294967311)
+
+def job_shingles(job: Dict, size: int = 3) -> set:
+    """Word shingles over the normalized title, company and description of a posting"""
+    title = [TITLE_ABBREVIATIONS.get(token, token) for token in tokenize(job.get('title', ''))]
+    company = tokenize(job.get('company', ''))
+    while company and company[-1] in COMPANY_SUFFIXES:
+        company.pop()
+    tokens = title + company + tokenize(job.get('description', ''))
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[start:start + size]) for start in range(len(tokens) - size + 1)}
+
+def job_location(job: Dict) -> str:
+    """Normalized location, as job_fingerprint sees it"""
+    return " ".join(tokenize(job.get('location', '')))
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) whose S-curve crosses 1/2 closest to the similarity threshold"""
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)]
+    return min(candidates, key=lambda band_rows: abs((1 / band_rows[0]) ** (1 / band_rows[1]) - threshold))
+
+class NearDuplicateDetector:
+    """MinHash signatures bucketed by LSH bands, so each posting is compared only with likely matches.
+
+    Buckets are per normalized location: the same role posted in two places has two
+    fingerprints and stays two postings, however alike the text is.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=self.bands * self.rows, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=self.bands * self.rows, dtype=np.uint64)
+        self._buckets: List[Dict[Tuple[str, bytes], List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, shingles: set) -> np.ndarray:
+        """MinHash of a shingle set under every permutation"""
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+    def add(self, job: Dict) -> bool:
+        """Remember a posting unless it nearly duplicates one already seen; True if it was new"""
+        shingles = job_shingles(job, self.shingle_size)
+        if not shingles:
+            return True
+        signature = self.signature(shingles)
+        location = job_location(job)
+        keys = [(location, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+        checked = set()
+        for band, key in enumerate(keys):
+            for doc_id in self._buckets[band].get(key, ()):
+                if doc_id in checked:
+                    continue
+                checked.add(doc_id)
+                # The fraction of agreeing minhashes estimates the Jaccard similarity
+                if np.mean(self._signatures[doc_id] == signature) >= self.threshold:
+                    return False
+
+        doc_id = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+        return True
+
+    def filter(self, jobs: List[Dict]) -> List[Dict]:
+        """Keep the first of every group of near-duplicate postings"""
+        return [job for job in jobs if self.add(job)]
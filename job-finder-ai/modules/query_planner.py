@@ -0,0 +1,159 @@
+"""Shared search planning: scrape each distinct job search once for a batch of users.
+
+Users whose top skills differ only in order, case or aliases ("JS" vs "JavaScript")
+get the same canonical query. Queries are keyed on skills and location only, as the
+boards are searched by those alone. A query whose skills include every skill of a
+broader query for the same location is subsumed: every job matching all of its
+terms also matches the broader query. Results are capped, though, so the broader
+query is scraped with max_jobs for each distinct search it serves; its newest
+results can still crowd out some jobs the narrower search would have found.
+
+Usage: python -m modules.query_planner RESUMES.jsonl [-o matches.jsonl] [--location L]
+
+Without -o only the plan is printed; with it every planned query is scraped once and
+each resume is matched against the results of the query serving it.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .batch_match import MATCH_FIELDS
+from .job_index import JobIndex
+from .job_scraper import JobScraper
+from .job_store import get_job_store
+from .matching_engine import MatchingEngine
+from .skill_store import SkillStore, get_skill_store
+
+# stream_jobs searches for the first five skills
+QUERY_SKILLS = 5
+
+class SearchQuery(NamedTuple):
+    skills: Tuple[str, ...]
+    location: str
+
+def canonical_skills(skills: Iterable[str], skill_store: Optional[SkillStore] = None,
+                     limit: int = QUERY_SKILLS) -> Tuple[str, ...]:
+    """The skills a search would use, alias-normalized, deduplicated and sorted"""
+    if skill_store is None:
+        skill_store = get_skill_store()
+    canonical = {}
+    for skill in skills:
+        name = skill_store.canonical(skill) or skill.strip()
+        if name:
+            canonical.setdefault(name.lower(), name)
+        if len(canonical) == limit:
+            break
+    return tuple(canonical[key] for key in sorted(canonical))
+
+class QueryPlan:
+    """Which query to scrape for every user, with each distinct query scraped once"""
+
+    def __init__(self):
+        self.assignments: Dict[str, SearchQuery] = {}
+        self.queries: Dict[SearchQuery, List[str]] = {}
+        # Distinct requested searches each planned query stands in for, itself included
+        self.served: Dict[SearchQuery, int] = {}
+        self.requested = 0
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def assign(self, user_id: str, query: SearchQuery) -> None:
+        self.assignments[user_id] = query
+        self.queries.setdefault(query, []).append(user_id)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'users': len(self.assignments),
+            'requested_queries': self.requested,
+            'planned_queries': len(self.queries),
+            'reduction': self.requested / len(self.queries) if self.queries else 1.0
+        }
+
+def plan_queries(searches: Iterable[Tuple[str, Iterable[str], str]], min_query_skills: int = 2,
+                 skill_store: Optional[SkillStore] = None) -> QueryPlan:
+    """Plan the scrapes for (user id, skills, location) searches.
+
+    A query serves the users of narrower queries only if it has at least
+    min_query_skills skills, so a one-word search does not stand in for everyone.
+    Among the queries that could serve a user, the most specific one is used.
+    """
+    wanted: Dict[SearchQuery, List[str]] = {}
+    for user_id, skills, location in searches:
+        query = SearchQuery(canonical_skills(skills, skill_store), location)
+        wanted.setdefault(query, []).append(user_id)
+
+    plan = QueryPlan()
+    plan.requested = len(wanted)
+    kept: Dict[str, List[Tuple[SearchQuery, frozenset]]] = {}
+    # Broadest first, so a query's possible subsumers are all decided before it
+    for query in sorted(wanted, key=lambda query: (len(query.skills), query.skills)):
+        skill_set = frozenset(skill.lower() for skill in query.skills)
+        group = kept.setdefault(query.location, [])
+        covering = [(candidate, skills) for candidate, skills in group if skills < skill_set]
+        if covering:
+            target = max(covering, key=lambda item: len(item[1]))[0]
+        else:
+            target = query
+            if len(skill_set) >= min_query_skills:
+                group.append((query, skill_set))
+        plan.served[target] = plan.served.get(target, 0) + 1
+        for user_id in wanted[query]:
+            plan.assign(user_id, target)
+    return plan
+
+def execute_plan(plan: QueryPlan, scraper: JobScraper, max_jobs: int = 50) -> Dict[SearchQuery, List[Dict]]:
+    """Scrape every planned query once, with max_jobs for each distinct search it serves"""
+    results = {}
+    for query in plan.queries:
+        jobs = []
+        for _, source_jobs in scraper.stream_jobs(list(query.skills), query.location,
+                                                  max_jobs=max_jobs * plan.served[query]):
+            jobs.extend(source_jobs)
+        results[query] = jobs
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan (and run) one scrape per distinct search for many resumes")
+    parser.add_argument('resumes', help="JSONL of parsed resumes, as written by modules.bulk_ingest")
+    parser.add_argument('-o', '--output', default=None, help="scrape and write each resume's matches here")
+    parser.add_argument('--location', default="Remote", help="location for resumes that do not set one")
+    parser.add_argument('--min-query-skills', type=int, default=2,
+                        help="skills a query needs before it may serve narrower ones")
+    parser.add_argument('-k', '--top-k', type=int, default=5, help="matches to keep per resume")
+    args = parser.parse_args(argv)
+
+    resumes = {}
+    with open(args.resumes, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            if line.strip():
+                resume_data = json.loads(line)
+                resumes[str(resume_data.get('source_file', number))] = resume_data
+
+    plan = plan_queries(((user_id, resume_data.get('skills', []), resume_data.get('location', args.location))
+                         for user_id, resume_data in resumes.items()), args.min_query_skills)
+    stats = plan.stats()
+    print(f"{stats['users']} resumes, {stats['requested_queries']} distinct searches, "
+          f"{stats['planned_queries']} to scrape ({stats['reduction']:.1f}x fewer)", file=sys.stderr)
+    if args.output is None:
+        return
+
+    start = time.perf_counter()
+    # Saved to the job store like the app's searches, so later batch runs can match against them
+    results = execute_plan(plan, JobScraper(store=get_job_store()))
+    print(f"Scraped {len(results)} queries in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    engine = MatchingEngine()
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for query, user_ids in plan.queries.items():
+            # One index per scrape, shared by every user it serves
+            index = JobIndex(results[query])
+            for user_id in user_ids:
+                matches = engine.find_best_matches(resumes[user_id], index.jobs, top_k=args.top_k, index=index)
+                matches = [{field: match[field] for field in MATCH_FIELDS if field in match} for match in matches]
+                out.write(json.dumps({'resume': user_id, 'query': list(query.skills), 'matches': matches},
+                                     ensure_ascii=False) + '\n')
+
+if __name__ == '__main__':
+    main()
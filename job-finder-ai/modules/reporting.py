@@ -0,0 +1,34 @@
+"""User-facing problem reports from the engines, decoupled from any UI.
+
+Reports go to the 'job_finder' logger unless a reporter callback is installed;
+the Streamlit app installs one that shows them on the page.
+"""
+import logging
+from typing import Callable, Optional
+
+# Called with a logging level and the message
+Reporter = Callable[[int, str], None]
+
+logger = logging.getLogger('job_finder')
+_reporter: Optional[Reporter] = None
+
+def set_reporter(reporter: Optional[Reporter]) -> None:
+    """Send reports to a callback instead of the log; None restores logging"""
+    global _reporter
+    _reporter = reporter
+
+def report(level: int, message: str) -> None:
+    reporter = _reporter
+    if reporter is None:
+        logger.log(level, message)
+    else:
+        reporter(level, message)
+
+def error(message: str) -> None:
+    report(logging.ERROR, message)
+
+def warning(message: str) -> None:
+    report(logging.WARNING, message)
+
+def info(message: str) -> None:
+    report(logging.INFO, message)
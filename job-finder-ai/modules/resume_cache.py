@@ -0,0 +1,91 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+class ResumeCache:
+    """Content-addressed cache of parsed resumes with a bounded memory tier and a bounded disk tier"""
+
+    def __init__(self, directory: str = 'cache/resumes', version: int = 1,
+                 max_memory_entries: int = 128, max_disk_entries: int = 5000):
+        self.directory = Path(directory)
+        self.version = version
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._disk_entries = sum(1 for _ in self.directory.glob('*.json'))
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        """SHA-256 of the uploaded file's bytes"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached resume data, checking memory before disk"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return copy.deepcopy(self._memory[key])
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+
+        with self._lock:
+            # Entries written by an older parser are treated as misses
+            if entry is None or entry.get('version') != self.version:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._remember(key, entry['resume_data'])
+        return copy.deepcopy(entry['resume_data'])
+
+    def put(self, key: str, resume_data: Dict) -> None:
+        """Store parsed resume data in both tiers"""
+        path = self._path(key)
+        existed = path.exists()
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': self.version, 'resume_data': resume_data}, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, copy.deepcopy(resume_data))
+            if not existed:
+                self._disk_entries += 1
+            if self._disk_entries > self.max_disk_entries:
+                self._evict_disk()
+
+    def _remember(self, key: str, resume_data: Dict) -> None:
+        self._memory[key] = resume_data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently written files until the disk tier is back within bounds"""
+        files = sorted(self.directory.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        excess = len(files) - self.max_disk_entries
+        for path in files[:max(excess, 0)]:
+            path.unlink(missing_ok=True)
+        self._disk_entries = len(files) - max(excess, 0)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+@lru_cache(maxsize=None)
+def get_default_resume_cache(version: int = 1) -> ResumeCache:
+    """Process-wide cache shared by every ResumeParser, so the memory tier survives between submits"""
+    return ResumeCache(version=version)
@@ -1,162 +1,143 @@
-import PyPDF2
-import docx
-import re
-from typing import Dict, List
-import streamlit as st
-from .utils import load_skills_database
+import io
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from . import reporting
+from .field_extractor import ResumeFieldExtractor
+from .resume_cache import ResumeCache, get_default_resume_cache
+from .skill_extractor import get_skill_extractor
+
+# Bump when the shape or extraction rules of resume_data change, so cached results are not reused
+RESUME_DATA_VERSION = 1
+
+MIME_TYPES = {
+    '.pdf': "application/pdf",
+    '.docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
 
 class ResumeParser:
-    def __init__(self):
-        self.skills_db = load_skills_database()
+    def __init__(self, use_cache: bool = True, cache: Optional[ResumeCache] = None,
+                 keep_raw_text: bool = True):
+        self.skill_extractor = get_skill_extractor()
+        # Long CVs need not be held in memory as one string when the caller drops raw_text anyway
+        self.keep_raw_text = keep_raw_text
+        if use_cache and cache is None:
+            cache = get_default_resume_cache(RESUME_DATA_VERSION)
+        self.cache = cache
     
-    def parse_resume(self, uploaded_file):
+    def parse_resume(self, uploaded_file, timings: Optional[Dict[str, float]] = None):
         """Parse resume and extract relevant information"""
+        return self.parse_bytes(self._read_bytes(uploaded_file), uploaded_file.type, timings)
+    
+    def parse_file(self, path: str, timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Parse a PDF or DOCX resume from disk"""
+        file_type = MIME_TYPES.get(Path(path).suffix.lower())
+        if file_type is None:
+            raise ValueError("Unsupported file format")
+        with open(path, 'rb') as file:
+            return self.parse_bytes(file.read(), file_type, timings)
+    
+    def parse_bytes(self, content: bytes, file_type: str,
+                    timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Parse resume bytes of the given MIME type, adding per-stage seconds to timings"""
+        
+        # Resubmitting the same file skips text extraction and parsing entirely
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(content)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        errors: List[Exception] = []
+        chunks = self._report_read_errors(self.iter_text(content, file_type), file_type, errors)
+        resume_data, text_length = self._parse_chunks(chunks, timings)
+        
+        # A read error leaves a partial parse; the next upload of the file should try again
+        if cache_key is not None and text_length and not errors:
+            self.cache.put(cache_key, resume_data)
         
-        # Extract text from file
-        if uploaded_file.type == "application/pdf":
-            text = self._extract_text_from_pdf(uploaded_file)
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            text = self._extract_text_from_docx(uploaded_file)
+        return resume_data
+    
+    def parse_stream(self, chunks: Iterable[str], timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Parse resume text arriving in pieces (pages, paragraphs) without joining it first"""
+        resume_data, _ = self._parse_chunks(chunks, timings)
+        return resume_data
+    
+    def iter_text(self, content: bytes, file_type: str) -> Iterator[str]:
+        """Lazily yield the text of each PDF page or DOCX paragraph"""
+        if file_type == "application/pdf":
+            return self._iter_text_from_pdf(io.BytesIO(content))
+        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+            return self._iter_text_from_docx(io.BytesIO(content))
         else:
             raise ValueError("Unsupported file format")
+    
+    def _parse_chunks(self, chunks: Iterable[str],
+                      timings: Optional[Dict[str, float]] = None) -> Tuple[Dict, int]:
+        """Run every field extractor incrementally over the chunks; returns (resume_data, text length)"""
+        if timings is None:
+            timings = {}
+        timings.setdefault('extract_text', 0.0)
+        timings.setdefault('extract_fields', 0.0)
+        
+        pieces = [] if self.keep_raw_text else None
+        text_length = 0
+        fields = ResumeFieldExtractor(self.skill_extractor)
+        
+        chunks = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            timings['extract_text'] += time.perf_counter() - start
+            if chunk is None:
+                break
+            
+            start = time.perf_counter()
+            chunk += "\n"
+            text_length += len(chunk.strip())
+            if pieces is not None:
+                pieces.append(chunk)
+            fields.feed(chunk, timings)
+            timings['extract_fields'] += time.perf_counter() - start
         
-        # Parse the extracted text
         resume_data = {
-            'raw_text': text,
-            'skills': self._extract_skills(text),
-            'experience_level': self._determine_experience_level(text),
-            'education': self._extract_education(text),
-            'job_titles': self._extract_job_titles(text),
-            'companies': self._extract_companies(text),
-            'contact_info': self._extract_contact_info(text)
+            # Joined once at the end, and only when the caller wants the full text
+            'raw_text': "".join(pieces) if pieces is not None else "",
+            **fields.result()
         }
-        
-        return resume_data
-    
-    def _extract_text_from_pdf(self, file) -> str:
-        """Extract text from PDF file"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            st.error(f"Error reading PDF: {str(e)}")
-            return ""
+        return resume_data, text_length
     
-    def _extract_text_from_docx(self, file) -> str:
-        """Extract text from DOCX file"""
+    def _report_read_errors(self, chunks: Iterator[str], file_type: str,
+                            errors: List[Exception]) -> Iterator[str]:
+        """Surface extraction errors to the user, appending them to errors, and keep whatever
+        text was read before them"""
+        label = "PDF" if file_type == "application/pdf" else "DOCX"
         try:
-            doc = docx.Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            yield from chunks
         except Exception as e:
-            st.error(f"Error reading DOCX: {str(e)}")
-            return ""
-    
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
-        found_skills = []
-        text_lower = text.lower()
-        
-        # Check against skills database
-        for skill in self.skills_db:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        # Remove duplicates and return
-        return list(set(found_skills))
+            errors.append(e)
+            reporting.error(f"Error reading {label}: {str(e)}")
     
-    def _determine_experience_level(self, text: str) -> str:
-        """Determine experience level based on resume content"""
-        text_lower = text.lower()
-        
-        # Count years of experience mentioned
-        years_pattern = r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
-        years_matches = re.findall(years_pattern, text_lower)
-        
-        if years_matches:
-            max_years = max(int(year) for year in years_matches)
-            if max_years >= 8:
-                return "Senior Level"
-            elif max_years >= 3:
-                return "Mid Level"
-            else:
-                return "Entry Level"
-        
-        # Check for senior indicators
-        senior_indicators = ['senior', 'lead', 'principal', 'architect', 'director', 'manager']
-        if any(indicator in text_lower for indicator in senior_indicators):
-            return "Senior Level"
-        
-        # Check for entry-level indicators
-        entry_indicators = ['intern', 'graduate', 'junior', 'entry', 'trainee']
-        if any(indicator in text_lower for indicator in entry_indicators):
-            return "Entry Level"
-        
-        return "Mid Level"  # Default
+    def _read_bytes(self, uploaded_file) -> bytes:
+        """Return the uploaded file's content"""
+        if hasattr(uploaded_file, 'getvalue'):
+            return uploaded_file.getvalue()
+        content = uploaded_file.read()
+        uploaded_file.seek(0)
+        return content
     
-    def _extract_education(self, text: str) -> List[str]:
-        """Extract education information"""
-        education = []
-        education_patterns = [
-            r'(bachelor|master|phd|doctorate|associate).*?(?:degree|of)',
-            r'(b\.?[ase]\.?|m\.?[ase]\.?|ph\.?d\.?)',
-            r'(university|college|institute)\s+of\s+\w+'
-        ]
-        
-        for pattern in education_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            education.extend(matches)
-        
-        return list(set(education))
+    def _iter_text_from_pdf(self, file) -> Iterator[str]:
+        """Yield the text of each PDF page"""
+        # Imported on first use: the PDF and DOCX libraries dominate this module's import time
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
     
-    def _extract_job_titles(self, text: str) -> List[str]:
-        """Extract job titles from resume"""
-        # This is a simplified extraction - in practice, you'd use more sophisticated NLP
-        job_title_patterns = [
-            r'(software engineer|developer|programmer|analyst|manager|director|consultant)',
-            r'(data scientist|machine learning|ai engineer|devops|product manager)',
-        ]
-        
-        titles = []
-        for pattern in job_title_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            titles.extend(matches)
-        
-        return list(set(titles))
-    
-    def _extract_companies(self, text: str) -> List[str]:
-        """Extract company names (simplified)"""
-        # This would typically use NER or company databases
-        companies = []
-        company_indicators = ['inc', 'llc', 'corp', 'ltd', 'company', 'technologies']
-        
-        lines = text.split('\n')
-        for line in lines:
-            if any(indicator in line.lower() for indicator in company_indicators):
-                # Simple extraction - in practice, use NER
-                companies.append(line.strip()[:50])  # Limit length
-        
-        return companies[:5]  # Return top 5
-    
-    def _extract_contact_info(self, text: str) -> Dict[str, str]:
-        """Extract contact information"""
-        contact = {}
-        
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_matches = re.findall(email_pattern, text)
-        if email_matches:
-            contact['email'] = email_matches[0]
-        
-        # Phone pattern
-        phone_pattern = r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        phone_matches = re.findall(phone_pattern, text)
-        if phone_matches:
-            contact['phone'] = ''.join(phone_matches[0])
-        
-        return contact
+    def _iter_text_from_docx(self, file) -> Iterator[str]:
+        """Yield the text of each DOCX paragraph"""
+        import docx
+        doc = docx.Document(file)
+        for paragraph in doc.paragraphs:
+            yield paragraph.text
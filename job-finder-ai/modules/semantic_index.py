@@ -0,0 +1,130 @@
+import hashlib
+import importlib.util
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .job_store import job_fingerprint
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+# Below the number of records Chroma accepts in one write
+UPSERT_BATCH_SIZE = 5000
+
+def semantic_matching_available() -> bool:
+    """Whether the optional sentence-transformers and chromadb packages are installed"""
+    return all(importlib.util.find_spec(name) is not None for name in ('sentence_transformers', 'chromadb'))
+
+def job_text(job: Dict) -> str:
+    """The part of a posting that gets embedded"""
+    return f"{job.get('title', '')}. {job.get('company', '')}. {job.get('description', '')}"
+
+def text_digest(text: str) -> str:
+    """Short hash of embedded text, to tell when a posting's embedding is out of date"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def collection_name(model_name: str) -> str:
+    """Chroma collection for one model's embeddings; vectors from different models don't mix"""
+    slug = re.sub(r'[^a-zA-Z0-9]+', '-', model_name.rsplit('/', 1)[-1]).strip('-')[:32]
+    # The hash tells apart models whose names differ only in characters Chroma doesn't allow
+    return f"jobs-{slug}-{text_digest(model_name)}"
+
+def resume_text(resume_data: Dict) -> str:
+    """A short profile of the resume in the same register as a job posting"""
+    titles = ", ".join(resume_data.get('job_titles', []))
+    skills = ", ".join(resume_data.get('skills', []))
+    return f"{titles}. {resume_data.get('experience_level', '')}. Skills: {skills}"
+
+class SemanticJobIndex:
+    """Job posting embeddings in a persistent HNSW index, for retrieving candidates by meaning.
+
+    Postings are keyed by their job store fingerprint and embedded once per version of their
+    text; adding a posting that is already indexed costs a hash of its text.
+    """
+
+    def __init__(self, path: str = 'cache/semantic_index', model_name: str = DEFAULT_MODEL,
+                 model_cache: str = 'cache/models', batch_size: int = 64, exact_search_limit: int = 5000):
+        # Imported here because loading torch takes seconds and most runs never use this index
+        try:
+            import chromadb
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("Semantic matching requires the sentence-transformers and chromadb packages") from e
+
+        Path(model_cache).mkdir(parents=True, exist_ok=True)
+        self.model = SentenceTransformer(model_name, device='cpu', cache_folder=model_cache)
+        self.batch_size = batch_size
+        # Small candidate sets are cheaper to score exactly than to dig out of the ANN results
+        self.exact_search_limit = exact_search_limit
+        self.client = chromadb.PersistentClient(path=path)
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name(model_name), metadata={'hnsw:space': 'cosine', 'model': model_name}
+        )
+        # fingerprint -> digest of the text its embedding was computed from
+        records = self.collection.get(include=['metadatas'])
+        self._indexed: Dict[str, Optional[str]] = {
+            fingerprint: (metadata or {}).get('digest')
+            for fingerprint, metadata in zip(records['ids'], records['metadatas'])
+        }
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> int:
+        """Embed and index postings that are new or whose text changed; returns how many were embedded"""
+        new_jobs = {}
+        for job in jobs:
+            fingerprint = job.get('fingerprint') or job_fingerprint(job)
+            text = job_text(job)
+            digest = text_digest(text)
+            # A changed posting keeps its fingerprint, but an edited description needs a new vector
+            if self._indexed.get(fingerprint) != digest:
+                new_jobs[fingerprint] = (text, digest)
+        if not new_jobs:
+            return 0
+
+        ids = list(new_jobs)
+        metadatas = [{'digest': digest} for _, digest in new_jobs.values()]
+        embeddings = self.model.encode([text for text, _ in new_jobs.values()],
+                                       batch_size=self.batch_size, normalize_embeddings=True)
+        for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+            self.collection.upsert(ids=ids[start:start + UPSERT_BATCH_SIZE],
+                                   embeddings=embeddings[start:start + UPSERT_BATCH_SIZE].tolist(),
+                                   metadatas=metadatas[start:start + UPSERT_BATCH_SIZE])
+        self._indexed.update((fingerprint, digest) for fingerprint, (_, digest) in new_jobs.items())
+        return len(ids)
+
+    def search(self, resume_data: Dict, k: int = 100,
+               restrict_to: Optional[Collection[str]] = None) -> List[Tuple[str, float]]:
+        """Top-k postings for a resume as (fingerprint, cosine similarity), optionally among some fingerprints"""
+        if not self._indexed or k <= 0:
+            return []
+        query = self.model.encode([resume_text(resume_data)], normalize_embeddings=True)
+
+        if restrict_to is not None and len(restrict_to) <= self.exact_search_limit:
+            ids = [fingerprint for fingerprint in restrict_to if fingerprint in self._indexed]
+            if not ids:
+                return []
+            # Records may come back in any order, so ids and embeddings are read from the same call
+            records = self.collection.get(ids=ids, include=['embeddings'])
+            similarities = np.asarray(records['embeddings']) @ query[0]
+            top = np.argsort(-similarities)[:k]
+            return [(records['ids'][i], float(similarities[i])) for i in top]
+
+        n_results = k
+        if restrict_to is not None:
+            # Ask for more neighbours in proportion to how much of the index is out of scope
+            n_results = k * max(len(self._indexed) // max(len(restrict_to), 1), 1)
+        result = self.collection.query(query_embeddings=query.tolist(),
+                                       n_results=min(n_results, len(self._indexed)), include=['distances'])
+        matches = [(fingerprint, 1.0 - distance)
+                   for fingerprint, distance in zip(result['ids'][0], result['distances'][0])
+                   if restrict_to is None or fingerprint in restrict_to]
+        return matches[:k]
+
+@lru_cache(maxsize=1)
+def get_semantic_index() -> Optional[SemanticJobIndex]:
+    """Process-wide index so the model loads once, or None when the optional packages are missing"""
+    if not semantic_matching_available():
+        return None
+    return SemanticJobIndex()
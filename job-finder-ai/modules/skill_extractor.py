@@ -0,0 +1,110 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from .skill_store import get_skill_store
+
+class SkillExtractor:
+    """Aho-Corasick automaton that finds every known skill, or an alias of one, in one pass over a text"""
+
+    def __init__(self, skills: Iterable[str], aliases: Iterable[Tuple[str, str]] = ()):
+        self.skills: List[str] = []
+        self._skill_ids: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._pattern_ids: Dict[str, int] = {}
+        # Per pattern: its length and the skill it stands for
+        self._lengths: List[int] = []
+        self._pattern_skills: List[int] = []
+
+        for skill in skills:
+            self._add_pattern(skill, skill)
+        for alias, skill in aliases:
+            self._add_pattern(alias, skill)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _add_pattern(self, text: str, skill: str) -> None:
+        """Insert a spelling of a skill into the keyword trie"""
+        pattern = text.strip().lower()
+        if not pattern or pattern in self._pattern_ids:
+            return
+
+        skill = skill.strip()
+        if skill not in self._skill_ids:
+            self._skill_ids[skill] = len(self.skills)
+            self.skills.append(skill)
+        pattern_id = len(self._lengths)
+        self._lengths.append(len(pattern))
+        self._pattern_skills.append(self._skill_ids[skill])
+        self._pattern_ids[pattern] = pattern_id
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge suffix outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return (start, end, skill) for every whole-word skill occurrence"""
+        text_lower = text.lower()
+        text_length = len(text_lower)
+        matches = []
+        state = 0
+
+        for position, char in enumerate(text_lower):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for pattern_id in self._outputs[state]:
+                end = position + 1
+                start = end - self._lengths[pattern_id]
+                if self._is_word_boundary(text_lower, start, end, text_length):
+                    matches.append((start, end, self.skills[self._pattern_skills[pattern_id]]))
+
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Return the distinct skills found in the text, in order of appearance"""
+        found_skills = {}
+        for _, _, skill in self.find_all(text):
+            found_skills.setdefault(skill, None)
+        return list(found_skills)
+
+    @staticmethod
+    def _is_word_boundary(text: str, start: int, end: int, text_length: int) -> bool:
+        """Reject matches that sit inside a longer word, e.g. "go" in "google" """
+        if text[start].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if text[end - 1].isalnum() and end < text_length and text[end].isalnum():
+            return False
+        return True
+
+@lru_cache(maxsize=1)
+def get_skill_extractor() -> SkillExtractor:
+    """Build the skill extractor from the skill store once per process"""
+    store = get_skill_store()
+    return SkillExtractor(store, ((alias, store.name(skill_id)) for alias, skill_id in store.aliases()))
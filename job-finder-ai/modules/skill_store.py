@@ -0,0 +1,271 @@
+"""Memory-mapped skill taxonomy: interned skill ids, alias lookup and category membership.
+
+The store is compiled from data/skills_database.json and data/job_categories.json into
+data/skill_store.bin. Opening it maps the file and reads a fixed-size header, so loading
+costs the same for ten skills or a million, and every process that opens it shares the
+same read-only pages through the OS page cache.
+
+Usage: python -m modules.skill_store [--skills PATH] [--categories PATH] [-o PATH]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .utils import DATA_DIR, get_default_skills
+
+SKILLS_PATH = DATA_DIR / 'skills_database.json'
+CATEGORIES_PATH = DATA_DIR / 'job_categories.json'
+STORE_PATH = DATA_DIR / 'skill_store.bin'
+
+STORE_MAGIC = b'SKST'
+STORE_VERSION = 1
+# magic, version, uint32 item size, then counts and the offset of each section
+HEADER = struct.Struct('<4sIIIII7Q')
+
+class StringTable:
+    """Read-only view of a string section: an offsets array into a UTF-8 blob"""
+
+    def __init__(self, buffer: memoryview, offsets: memoryview):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._buffer[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+class SkillStore:
+    """Read-only skill taxonomy backed by a memory-mapped file"""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        (magic, version, item_size, skill_count, alias_count, category_count,
+         blob, skill_offsets, alias_offsets, alias_ids,
+         category_offsets, member_offsets, skill_category_offsets) = HEADER.unpack_from(view)
+        if magic != STORE_MAGIC or version != STORE_VERSION or item_size != array('I').itemsize:
+            raise ValueError(f"{self.path} is not a version {STORE_VERSION} skill store")
+
+        def ints(offset: int, count: int) -> memoryview:
+            return view[offset:offset + count * item_size].cast('I')
+
+        blob_view = view[blob:]
+        self._names = StringTable(blob_view, ints(skill_offsets, skill_count + 1))
+        self._aliases = StringTable(blob_view, ints(alias_offsets, alias_count + 1))
+        self._alias_ids = ints(alias_ids, alias_count)
+        self._categories = StringTable(blob_view, ints(category_offsets, category_count + 1))
+        # Category -> member skill ids and skill -> category ids, as offsets into one id array
+        self._member_offsets = ints(member_offsets, category_count + 1)
+        self._members = ints(member_offsets + (category_count + 1) * item_size, self._member_offsets[-1])
+        self._skill_category_offsets = ints(skill_category_offsets, skill_count + 1)
+        self._skill_categories = ints(skill_category_offsets + (skill_count + 1) * item_size,
+                                      self._skill_category_offsets[-1])
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        """Canonical skill names in id order"""
+        return (self._names[skill_id] for skill_id in range(len(self._names)))
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def name(self, skill_id: int) -> str:
+        """Canonical name of an interned skill id"""
+        return self._names[skill_id]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Skill id for a canonical name or alias, case-insensitively"""
+        key = name.strip().lower()
+        index = bisect_left(self._aliases, key)
+        if index < len(self._aliases) and self._aliases[index] == key:
+            return self._alias_ids[index]
+        return None
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical spelling of a skill name or alias"""
+        skill_id = self.lookup(name)
+        return None if skill_id is None else self._names[skill_id]
+
+    def aliases(self) -> Iterator[Tuple[str, int]]:
+        """Every lowercase alias (canonical names included) with its skill id, sorted by alias"""
+        for index in range(len(self._aliases)):
+            yield self._aliases[index], self._alias_ids[index]
+
+    def categories(self) -> List[str]:
+        return [self._categories[index] for index in range(len(self._categories))]
+
+    def category_skills(self, category: str) -> List[str]:
+        """Canonical names of the skills in a category"""
+        index = bisect_left(self._categories, category)
+        if index == len(self._categories) or self._categories[index] != category:
+            return []
+        members = self._members[self._member_offsets[index]:self._member_offsets[index + 1]]
+        return [self._names[skill_id] for skill_id in members]
+
+    def skill_categories(self, name: str) -> List[str]:
+        """Categories a skill (or one of its aliases) belongs to"""
+        skill_id = self.lookup(name)
+        if skill_id is None:
+            return []
+        start, end = self._skill_category_offsets[skill_id], self._skill_category_offsets[skill_id + 1]
+        return [self._categories[index] for index in self._skill_categories[start:end]]
+
+def load_taxonomy(skills_path: Path = SKILLS_PATH,
+                  categories_path: Path = CATEGORIES_PATH) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Read the JSON sources as ({canonical: aliases}, {category: skills}).
+
+    skills_database.json may be a list of names, {name: [aliases]} or
+    {name: {"aliases": [...], "categories": [...]}}; job_categories.json maps a
+    category to the names or aliases of its skills. A missing or empty skills file
+    falls back to the built-in default skills.
+    """
+    skills_data = _read_json(skills_path) or get_default_skills()
+    categories_data = _read_json(categories_path) or {}
+
+    skills: Dict[str, List[str]] = {}
+    categories: Dict[str, List[str]] = {}
+    if isinstance(skills_data, dict):
+        for name, entry in skills_data.items():
+            if isinstance(entry, dict):
+                skills[name] = list(entry.get('aliases', []))
+                for category in entry.get('categories', []):
+                    categories.setdefault(category, []).append(name)
+            else:
+                skills[name] = list(entry or [])
+    else:
+        skills = {name: [] for name in skills_data}
+
+    for category, members in categories_data.items():
+        categories.setdefault(category, []).extend(members)
+    return skills, categories
+
+def build_skill_store(skills: Dict[str, List[str]], categories: Dict[str, List[str]],
+                      output: Path = STORE_PATH) -> Dict[str, int]:
+    """Compile a taxonomy into a store file, replacing any existing one atomically"""
+    names: List[str] = []
+    alias_ids: Dict[str, int] = {}
+
+    def intern(name: str) -> Optional[int]:
+        name = name.strip()
+        key = name.lower()
+        if not key:
+            return None
+        if key not in alias_ids:
+            alias_ids[key] = len(names)
+            names.append(name)
+        return alias_ids[key]
+
+    for name in skills:
+        intern(name)
+    for name, aliases in skills.items():
+        skill_id = alias_ids.get(name.strip().lower())
+        for alias in aliases:
+            # The first skill to claim an alias keeps it
+            if skill_id is not None and alias.strip():
+                alias_ids.setdefault(alias.strip().lower(), skill_id)
+
+    category_names = sorted(categories)
+    members: List[List[int]] = []
+    skill_categories: List[List[int]] = [[] for _ in names]
+    for category_id, category in enumerate(category_names):
+        # Category members not listed in the skills file become skills of their own
+        member_ids = sorted({skill_id for skill_id in map(intern, categories[category]) if skill_id is not None})
+        members.append(member_ids)
+        skill_categories.extend([] for _ in range(len(names) - len(skill_categories)))
+        for skill_id in member_ids:
+            skill_categories[skill_id].append(category_id)
+
+    aliases = sorted(alias_ids)
+    blob = bytearray()
+
+    def string_offsets(strings: Iterable[str]) -> array:
+        offsets = array('I', [len(blob)])
+        for string in strings:
+            blob.extend(string.encode('utf-8'))
+            offsets.append(len(blob))
+        return offsets
+
+    def csr(rows: List[List[int]]) -> array:
+        """Row offsets followed by the concatenated rows"""
+        offsets, values = array('I', [0]), array('I')
+        for row in rows:
+            values.extend(row)
+            offsets.append(len(values))
+        return offsets + values
+
+    sections = [
+        string_offsets(names),
+        string_offsets(aliases),
+        array('I', (alias_ids[alias] for alias in aliases)),
+        string_offsets(category_names),
+        csr(members),
+        csr(skill_categories)
+    ]
+
+    offset = HEADER.size
+    section_offsets = []
+    for section in sections:
+        section_offsets.append(offset)
+        offset += len(section) * section.itemsize
+    header = HEADER.pack(STORE_MAGIC, STORE_VERSION, array('I').itemsize, len(names), len(aliases),
+                         len(category_names), offset, *section_offsets)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        for section in sections:
+            section.tofile(file)
+        file.write(blob)
+    os.replace(tmp_path, output)
+    return {'skills': len(names), 'aliases': len(aliases), 'categories': len(category_names),
+            'bytes': offset + len(blob)}
+
+@lru_cache(maxsize=1)
+def get_skill_store() -> SkillStore:
+    """Open the process-wide store, compiling it first if the JSON sources are newer"""
+    sources = [path for path in (SKILLS_PATH, CATEGORIES_PATH) if path.exists()]
+    newest_source = max((path.stat().st_mtime for path in sources), default=0.0)
+    if not STORE_PATH.exists() or STORE_PATH.stat().st_mtime < newest_source:
+        build_skill_store(*load_taxonomy())
+    try:
+        return SkillStore(STORE_PATH)
+    except ValueError:
+        # Written by an older version of this module
+        build_skill_store(*load_taxonomy())
+        return SkillStore(STORE_PATH)
+
+def _read_json(path: Path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the skill taxonomy into a memory-mapped store")
+    parser.add_argument('--skills', type=Path, default=SKILLS_PATH, help="skills JSON file")
+    parser.add_argument('--categories', type=Path, default=CATEGORIES_PATH, help="categories JSON file")
+    parser.add_argument('-o', '--output', type=Path, default=STORE_PATH, help="store file to write")
+    args = parser.parse_args(argv)
+
+    stats = build_skill_store(*load_taxonomy(args.skills, args.categories), args.output)
+    print(f"Wrote {args.output}: {stats['skills']} skills, {stats['aliases']} aliases, "
+          f"{stats['categories']} categories, {stats['bytes'] / 1024:.0f} KiB", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,20 @@
 import os
+import re
 import json
 from pathlib import Path
+from typing import List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+# Keeps skill spellings such as "c++", "c#" and "node.js" as single tokens
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
 
 def create_directories():
     """Create necessary directories if they don't exist"""
-    directories = ["data", "uploads", "logs", "templates"]
+    directories = ["data", "uploads", "logs", "templates", "cache"]
     for directory in directories:
         Path(directory).mkdir(exist_ok=True)
 
@@ -20,6 +30,20 @@ def load_config():
     }
     return config
 
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme/host, no default port or fragment, sorted query"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
 def load_json_file(file_path):
     """Load and return JSON data from file"""
     try:
@@ -45,11 +69,12 @@ def save_json_file(data, file_path):
 def load_skills_database():
     """Load skills database from JSON file or return default skills"""
     try:
-        with open('data/skills_database.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Return default skills if file doesn't exist
-        return get_default_skills()
+        with open(DATA_DIR / 'skills_database.json', 'r', encoding='utf-8') as f:
+            skills = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        skills = None
+    # Return default skills if the file doesn't exist or is empty
+    return skills or get_default_skills()
 
 def get_default_skills():
     """Return a comprehensive list of default skills"""
@@ -92,7 +117,7 @@ def get_default_skills():
 def save_skills_database(skills):
     """Save skills database to JSON file"""
     try:
-        with open('data/skills_database.json', 'w') as f:
+        with open(DATA_DIR / 'skills_database.json', 'w', encoding='utf-8') as f:
             json.dump(skills, f, indent=2)
     except Exception as e:
         print(f"Failed to save skills database: {str(e)}")
@@ -0,0 +1,188 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from modules.email_queue import EmailOutbox, EmailQueue, account_key
+
+class FakeEmailService:
+    """Stands in for EmailService: records deliveries and fails the first few on request"""
+
+    def __init__(self, sender_email="me@example.com", sender_password="app-password", failures=0):
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.failures = failures
+        self.delivered = []
+        self.closed = False
+
+    def build_job_recommendations(self, user_name, user_email, job_matches, resume_data):
+        return {'To': user_email}
+
+    def deliver(self, msg):
+        if self.sender_password != "app-password":
+            return {'to': msg['To'], 'sent': False, 'latency': 0.0, 'error': "535 bad credentials"}
+        if self.failures:
+            self.failures -= 1
+            return {'to': msg['To'], 'sent': False, 'latency': 0.0, 'error': "421 try again later"}
+        self.delivered.append(msg['To'])
+        return {'to': msg['To'], 'sent': True, 'latency': 0.0, 'error': None}
+
+    def close(self):
+        self.closed = True
+
+class FlakyQueue(EmailQueue):
+    """An EmailQueue whose first mark_sent hits a locked database"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.lock_errors = 1
+
+    def mark_sent(self, message_id):
+        if self.lock_errors:
+            self.lock_errors -= 1
+            raise sqlite3.OperationalError("database is locked")
+        super().mark_sent(message_id)
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+class EmailQueueRetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue = EmailQueue(str(Path(self.directory.name) / "outbox.sqlite3"))
+        self.account = account_key("me@example.com", "app-password")
+        self.message_id = self.queue.enqueue("me@example.com", "User", "user@example.com", [], {}, self.account)
+
+    def tearDown(self):
+        self.queue._conn.close()
+        self.directory.cleanup()
+
+    def row(self):
+        return self.queue._conn.execute(
+            'SELECT status, attempts, next_attempt_at, last_error FROM outbox WHERE id = ?', (self.message_id,)
+        ).fetchone()
+
+    def test_failed_attempts_back_off_exponentially_with_jitter(self):
+        for attempt in range(1, 4):
+            self.assertIsNotNone(self.queue.claim([self.account]))
+            before = time.time()
+            self.queue.mark_failed(self.message_id, "421 try again later", max_attempts=5, backoff=60)
+
+            status, attempts, next_attempt_at, last_error = self.row()
+            self.assertEqual((status, attempts, last_error), ('pending', attempt, "421 try again later"))
+            delay = next_attempt_at - before
+            self.assertGreaterEqual(delay, 60 * 2 ** (attempt - 1) * 0.8 - 1)
+            self.assertLessEqual(delay, 60 * 2 ** (attempt - 1) * 1.2 + 1)
+            # Not due yet, so no worker can pick it up
+            self.assertIsNone(self.queue.claim([self.account]))
+            self.queue._conn.execute('UPDATE outbox SET next_attempt_at = 0 WHERE id = ?', (self.message_id,))
+
+    def test_message_fails_for_good_after_max_attempts(self):
+        for _ in range(3):
+            self.assertIsNotNone(self.queue.claim([self.account]))
+            self.queue.mark_failed(self.message_id, "550 mailbox unavailable", max_attempts=3, backoff=0)
+
+        self.assertEqual(self.row()[:2], ('failed', 3))
+        self.assertIsNone(self.queue.claim([self.account]))
+        self.assertEqual(self.queue.metrics()['failed'], 1)
+
+class EmailOutboxTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / "outbox.sqlite3")
+        self.outboxes = []
+
+    def tearDown(self):
+        for outbox in self.outboxes:
+            outbox.stop(timeout=5)
+            outbox.queue._conn.close()
+        self.directory.cleanup()
+
+    def outbox(self, queue=None, **options):
+        options.setdefault('poll_interval', 0.01)
+        outbox = EmailOutbox(queue or EmailQueue(self.path), **options)
+        self.outboxes.append(outbox)
+        return outbox
+
+    def enqueue(self, outbox, service, recipient="user@example.com"):
+        return outbox.enqueue(service, "User", recipient, [], {'skills': [], 'experience_level': ""})
+
+    def test_worker_survives_database_errors(self):
+        outbox = self.outbox(FlakyQueue(self.path))
+        service = FakeEmailService()
+        outbox.start()
+        self.enqueue(outbox, service)
+
+        self.assertTrue(wait_until(lambda: outbox.metrics()['sent'] == 1))
+        self.assertTrue(all(thread.is_alive() for thread in outbox._threads))
+
+    def test_transient_failures_are_retried_until_sent(self):
+        outbox = self.outbox(max_attempts=5, backoff=0.01)
+        service = FakeEmailService(failures=2)
+        message_id = self.enqueue(outbox, service)
+        outbox.start()
+
+        self.assertTrue(wait_until(lambda: outbox.metrics()['sent'] == 1))
+        self.assertEqual(service.delivered, ["user@example.com"])
+        attempts = outbox.queue._conn.execute('SELECT attempts FROM outbox WHERE id = ?', (message_id,)).fetchone()
+        self.assertEqual(attempts, (3,))
+
+    def test_start_recovers_messages_left_sending(self):
+        queue = EmailQueue(self.path)
+        service = FakeEmailService()
+        account = account_key(service.sender_email, service.sender_password)
+        queue.enqueue(service.sender_email, "User", "user@example.com", [], {}, account)
+        self.assertIsNotNone(queue.claim([account]))
+
+        outbox = self.outbox(queue)
+        outbox.register(service)
+        outbox.start()
+
+        self.assertTrue(wait_until(lambda: outbox.metrics()['sent'] == 1))
+        self.assertEqual(service.delivered, ["user@example.com"])
+
+    def test_wrong_password_for_a_sender_does_not_take_over_its_queued_mail(self):
+        outbox = self.outbox(max_attempts=1)
+        working = FakeEmailService()
+        wrong = FakeEmailService(sender_password="typo")
+        self.enqueue(outbox, working, "first@example.com")
+        # Another session registers the same sender with a bad password before the workers run
+        self.enqueue(outbox, wrong, "second@example.com")
+        outbox.start()
+
+        self.assertTrue(wait_until(lambda: outbox.metrics()['sent'] + outbox.metrics()['failed'] == 2))
+        self.assertEqual(working.delivered, ["first@example.com"])
+        self.assertEqual(outbox.metrics()['failed'], 1)
+
+    def test_messages_queued_before_accounts_go_to_any_service_for_the_sender(self):
+        queue = EmailQueue(self.path)
+        service = FakeEmailService()
+        queue.enqueue(service.sender_email, "User", "old@example.com", [], {})
+
+        outbox = self.outbox(queue)
+        outbox.register(service)
+        outbox.start()
+
+        self.assertTrue(wait_until(lambda: service.delivered == ["old@example.com"]))
+
+    def test_replacing_a_service_for_the_same_account_closes_the_old_one(self):
+        outbox = self.outbox()
+        old, new = FakeEmailService(), FakeEmailService()
+        self.assertEqual(outbox.register(old), outbox.register(old))
+        self.assertFalse(old.closed)
+
+        outbox.register(new)
+
+        self.assertTrue(old.closed)
+        self.assertFalse(new.closed)
+
+if __name__ == '__main__':
+    unittest.main()
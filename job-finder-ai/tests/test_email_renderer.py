@@ -0,0 +1,49 @@
+import unittest
+
+from modules.email_renderer import EmailRenderer
+
+RESUME = {'skills': ["Python", "<SQL>"], 'experience_level': "Mid Level"}
+
+def job(**fields):
+    return {'title': "Python Developer", 'company': "Acme", 'location': "Remote", 'job_type': "Full-time",
+            'url': "https://jobs.example.com/1", 'match_score': 0.87, 'skills_match': ["Python"], **fields}
+
+class EmailRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        self.renderer = EmailRenderer()
+
+    def test_job_fields_are_escaped_in_cached_cards(self):
+        hostile = job(title="<script>alert(1)</script>", company="Smith & Sons",
+                      url='https://jobs.example.com/1" onclick="steal()', skills_match=["<b>Python</b>"])
+
+        for _ in range(2):
+            html = self.renderer.render("<i>Ann</i>", [hostile], RESUME)
+            self.assertNotIn("<script>", html)
+            self.assertIn("&lt;script&gt;alert(1)&lt;/script&gt;", html)
+            self.assertIn("Smith &amp; Sons", html)
+            self.assertNotIn('" onclick="', html)
+            self.assertIn("&lt;b&gt;Python&lt;/b&gt;", html)
+            self.assertIn("&lt;i&gt;Ann&lt;/i&gt;", html)
+            self.assertIn("&lt;SQL&gt;", html)
+        self.assertEqual(self.renderer.stats, {'card_hits': 1, 'card_misses': 1})
+
+    def test_per_user_slots_are_filled_for_each_user(self):
+        first = self.renderer.render("Ann", [job(match_score=0.87, skills_match=["Python"])], RESUME)
+        second = self.renderer.render("Bob", [job(match_score=0.42, skills_match=["Django"])], RESUME)
+
+        self.assertIn("Match Score: 87%", first)
+        self.assertIn("Matching Skills: Python", first)
+        self.assertIn("Match Score: 42%", second)
+        self.assertIn("Matching Skills: Django", second)
+        self.assertEqual(self.renderer.stats['card_hits'], 1)
+
+    def test_reposted_job_with_a_new_url_gets_a_new_card(self):
+        self.renderer.render("Ann", [job()], RESUME)
+        html = self.renderer.render("Ann", [job(url="https://jobs.example.com/2")], RESUME)
+
+        self.assertIn('href="https://jobs.example.com/2"', html)
+        self.assertEqual(self.renderer.stats['card_misses'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import socketserver
+import threading
+import unittest
+from email.mime.text import MIMEText
+
+from modules.email_service import EmailService
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: refuses 'bad@' recipients and can hang up mid-session"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.count('connections')
+        accepted = 0
+        self.reply("220 fake ESMTP")
+        for raw in self.rfile:
+            command = raw.decode('ascii').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.reply("250-fake")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == 'AUTH':
+                server.count('logins')
+                self.reply("535 bad credentials" if server.bad_auth else "235 ok")
+            elif verb == 'MAIL':
+                if server.hangup_after is not None and accepted >= server.hangup_after:
+                    # Like a server that limits messages per session: close without a reply
+                    return
+                self.reply("250 ok")
+            elif verb == 'RCPT':
+                self.reply("550 no such user" if 'bad@' in command else "250 ok")
+            elif verb == 'RSET':
+                server.count('resets')
+                self.reply("250 ok")
+            elif verb == 'DATA':
+                self.reply("354 go ahead")
+                for line in self.rfile:
+                    if line.rstrip(b"\r\n") == b".":
+                        break
+                accepted += 1
+                server.count('sent')
+                self.reply("250 queued")
+            elif verb == 'QUIT':
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, bad_auth=False, hangup_after=None):
+        super().__init__(('127.0.0.1', 0), FakeSMTPHandler)
+        self.bad_auth = bad_auth
+        self.hangup_after = hangup_after
+        self.stats = {'connections': 0, 'logins': 0, 'resets': 0, 'sent': 0}
+        self._lock = threading.Lock()
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+def message(recipient):
+    msg = MIMEText("Your matches")
+    msg['Subject'] = "Jobs"
+    msg['From'] = "me@example.com"
+    msg['To'] = recipient
+    return msg
+
+class EmailServiceDeliveryTest(unittest.TestCase):
+
+    def start_server(self, **options):
+        server = FakeSMTPServer(**options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def service(self, server, **options):
+        service = EmailService("me@example.com", "app-password", "127.0.0.1", server.server_address[1],
+                               use_tls=False, **options)
+        self.addCleanup(service.close)
+        return service
+
+    def test_refused_login_is_not_retried(self):
+        server = self.start_server(bad_auth=True)
+
+        result = self.service(server, max_retries=3).deliver(message("user@example.com"))
+
+        self.assertFalse(result['sent'])
+        self.assertIn("535", result['error'])
+        self.assertEqual(server.stats['connections'], 1)
+
+    def test_refused_recipient_resets_and_reuses_the_connection(self):
+        server = self.start_server()
+        service = self.service(server, pool_size=1)
+
+        results = service.send_many([message("one@example.com"), message("bad@example.com"),
+                                     message("two@example.com")])
+
+        self.assertEqual([result['sent'] for result in results], [True, False, True])
+        self.assertIn("550", results[1]['error'])
+        # smtplib resets after a refused recipient itself, then the pool resets before reuse
+        self.assertGreaterEqual(server.stats['resets'], 1)
+        self.assertEqual(server.stats['connections'], 1)
+
+    def test_dropped_connections_are_retried_on_fresh_ones(self):
+        # Every tenth recipient is refused and the server hangs up after 20 messages a session
+        server = self.start_server(hangup_after=20)
+        service = self.service(server, pool_size=1)
+        recipients = [f"bad@{n}.example.com" if n % 10 == 9 else f"user{n}@example.com" for n in range(50)]
+
+        results = service.send_many(message(recipient) for recipient in recipients)
+
+        self.assertEqual(sum(result['sent'] for result in results), 45)
+        self.assertEqual([result['to'] for result in results if not result['sent']],
+                         [recipient for recipient in recipients if recipient.startswith("bad@")])
+        self.assertEqual(server.stats['sent'], 45)
+        self.assertEqual(server.stats['connections'], 3)
+
+    def test_gives_up_after_max_retries(self):
+        server = self.start_server(hangup_after=0)
+
+        result = self.service(server, max_retries=2).deliver(message("user@example.com"))
+
+        self.assertFalse(result['sent'])
+        self.assertEqual(server.stats['connections'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.job_index import JobStoreIndex
+from modules.job_store import JobStore, job_fingerprint
+from modules.matching_engine import MatchingEngine
+
+RESUME = {'skills': ["Python", "SQL"], 'experience_level': "Mid Level", 'job_titles': []}
+
+def posting(title, description, url=None):
+    return {'title': title, 'company': "Acme", 'location': "Remote", 'job_type': "Full-time",
+            'url': url or f"https://jobs.example.com/{title.lower().replace(' ', '-')}",
+            'description': description, 'source': "Test"}
+
+class JobStoreIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JobStore(str(Path(self.directory.name) / "jobs.sqlite3"))
+        self.store.upsert([posting("Python Developer", "Python and SQL"), posting("Data Analyst", "SQL reports")])
+        self.index = JobStoreIndex(self.store)
+        self.engine = MatchingEngine()
+
+    def tearDown(self):
+        self.store._conn.close()
+        self.directory.cleanup()
+
+    def titles(self):
+        return [job['title'] for job in self.index.match(self.engine, RESUME)]
+
+    def test_picks_up_new_postings(self):
+        self.assertEqual(self.titles(), ["Python Developer", "Data Analyst"])
+        self.store.upsert([posting("Python SQL Engineer", "Python SQL Python SQL")])
+
+        self.assertEqual(self.titles()[0], "Python SQL Engineer")
+
+    def test_returns_the_latest_version_of_a_changed_posting(self):
+        self.titles()
+        self.store.upsert([posting("Data Analyst", "SQL reports", url="https://jobs.example.com/reposted")])
+
+        urls = {job['title']: job['url'] for job in self.index.match(self.engine, RESUME)}
+        self.assertEqual(urls["Data Analyst"], "https://jobs.example.com/reposted")
+
+    def test_drops_expired_postings(self):
+        self.assertEqual(len(self.titles()), 2)
+        self.store._conn.execute('UPDATE jobs SET last_seen = 0 WHERE fingerprint = ?',
+                                 (job_fingerprint(posting("Data Analyst", "")),))
+        self.store.expire()
+
+        self.assertEqual(self.titles(), ["Python Developer"])
+        self.assertEqual(len(self.index.index), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Crawl tests for JobScraper against the saved result pages, served by a stand-in HTTP server.
+
+Run from job-finder-ai/: python -m pytest tests  (or python -m unittest discover tests)
+"""
+import re
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from modules import reporting
+from modules.job_scraper import JobScraper
+from modules.job_sources import IndeedSource, SimplyHiredSource
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+LOCATION = re.compile(r'(class="(?:companyLocation|SerpJob-location)">)')
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the Indeed fixture at /jobs and the SimplyHired one at /search, one copy per page.
+
+    Every page prefixes its locations with the page number, so each page holds distinct
+    jobs the way a live board's later pages do. Anything else answers 500.
+    """
+
+    pages = {'/jobs': "indeed_search.html", '/search': "simplyhired_search.html"}
+    requests = []
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = parse_qs(parts.query)
+        if parts.path == '/jobs':
+            page = int(params['start'][0]) // IndeedSource.page_size
+        elif parts.path == '/search':
+            page = int(params['pn'][0]) - 1
+        else:
+            self.requests.append((parts.path, None))
+            self.send_error(500)
+            return
+        self.requests.append((parts.path, page))
+
+        html = (FIXTURES / self.pages[parts.path]).read_text(encoding='utf-8')
+        body = LOCATION.sub(rf'\g<1>Page {page} ', html).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class IndeedMirror(IndeedSource):
+    """The same listings under another source name, as a board syndicating Indeed's would show them"""
+    name = "IndeedMirror"
+
+class BrokenSource(IndeedSource):
+    name = "Broken"
+
+    def build_url(self, query: str, location: str, page: int) -> str:
+        return f"{self.base_url}/broken?page={page}"
+
+class JobScraperCrawlTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FixtureHandler.requests = []
+        self.reports = []
+        reporting.set_reporter(lambda level, message: self.reports.append(message))
+
+    def tearDown(self):
+        reporting.set_reporter(None)
+
+    def crawl(self, sources, max_jobs, near_duplicate_threshold=0.8):
+        """All (source name, job) pairs a crawl yields"""
+        scraper = JobScraper(sources=sources, use_cache=False, near_duplicate_threshold=near_duplicate_threshold,
+                             request_interval=(0.0, 0.0))
+        return [(name, job) for name, jobs in scraper.stream_jobs(["python", "sql"], "Remote", max_jobs=max_jobs)
+                for job in jobs]
+
+    def test_fans_out_over_result_pages_up_to_max_pages(self):
+        source = IndeedSource(base_url=self.base_url)
+        source.max_pages = 3
+        jobs = self.crawl([source], max_jobs=100)
+
+        self.assertEqual(sorted(page for _, page in FixtureHandler.requests), [0, 1, 2])
+        self.assertEqual(len(jobs), 3 * 15)
+
+    def test_splits_max_jobs_between_sources(self):
+        jobs = self.crawl([IndeedSource(base_url=self.base_url), SimplyHiredSource(base_url=self.base_url)],
+                          max_jobs=20)
+
+        per_source = {}
+        for name, _ in jobs:
+            per_source[name] = per_source.get(name, 0) + 1
+        # Either source's first page alone could fill max_jobs
+        self.assertEqual(per_source, {"Indeed": 10, "SimplyHired": 10})
+
+    def test_stops_at_max_jobs(self):
+        jobs = self.crawl([SimplyHiredSource(base_url=self.base_url)], max_jobs=25)
+
+        self.assertEqual(len(jobs), 25)
+        self.assertLessEqual(len(FixtureHandler.requests), 2)
+
+    def test_drops_jobs_already_seen_on_another_source(self):
+        sources = [IndeedSource(base_url=self.base_url), IndeedMirror(base_url=self.base_url)]
+        for source in sources:
+            source.max_pages = 1
+        # Exact (fingerprint) dedup only; near-duplicate detection would also catch identical copies
+        jobs = self.crawl(sources, max_jobs=100, near_duplicate_threshold=None)
+
+        self.assertEqual(len(FixtureHandler.requests), 2)
+        fingerprints = [job['fingerprint'] for _, job in jobs]
+        self.assertEqual(len(fingerprints), 15)
+        self.assertEqual(len(set(fingerprints)), 15)
+
+    def test_failing_source_does_not_stop_the_stream(self):
+        jobs = self.crawl([BrokenSource(base_url=self.base_url), SimplyHiredSource(base_url=self.base_url)],
+                          max_jobs=40)
+
+        self.assertEqual({name for name, _ in jobs}, {"SimplyHired"})
+        self.assertEqual(len(jobs), 20)
+        self.assertTrue(any(message.startswith("Broken page 1 failed") for message in self.reports))
+
+if __name__ == '__main__':
+    unittest.main()
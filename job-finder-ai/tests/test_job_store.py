@@ -0,0 +1,106 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.job_store import JobStore, canonical_url
+
+def posting(title, company="Acme Inc", location="Remote", **fields):
+    return {'title': title, 'company': company, 'location': location,
+            'url': f"https://jobs.example.com/{title.lower().replace(' ', '-')}", 'description': "",
+            'source': "Test", **fields}
+
+class CanonicalUrlTest(unittest.TestCase):
+
+    def test_cosmetic_differences_and_tracking_parameters_are_dropped(self):
+        canonical = "https://jobs.example.com/view/1?id=5&lang=en"
+        for url in ["https://jobs.example.com/view/1?id=5&lang=en",
+                    "HTTPS://Jobs.Example.com:443/view/1/?lang=en&id=5",
+                    "https://jobs.example.com/view/1?utm_source=feed&id=5&gclid=abc&lang=en#apply",
+                    "https://jobs.example.com/view/1?ref=home&trk=x&id=5&lang=en"]:
+            with self.subTest(url=url):
+                self.assertEqual(canonical_url(url), canonical)
+
+    def test_meaningful_differences_are_kept(self):
+        self.assertNotEqual(canonical_url("https://jobs.example.com/view/1?id=5"),
+                            canonical_url("https://jobs.example.com/view/1?id=6"))
+        self.assertNotEqual(canonical_url("https://jobs.example.com/view/1"),
+                            canonical_url("https://jobs.example.com/View/1"))
+
+    def test_missing_or_non_web_urls_have_no_canonical_form(self):
+        for url in ["", "mailto:jobs@example.com", "/view/1"]:
+            self.assertEqual(canonical_url(url), "")
+
+class JobStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / "jobs.sqlite3")
+        self.store = JobStore(self.path)
+
+    def tearDown(self):
+        self.store._conn.close()
+        self.directory.cleanup()
+
+    def test_upsert_merges_the_same_posting_from_different_boards(self):
+        stats = self.store.upsert([
+            posting("Data Engineer", company="Acme Inc"),
+            # Same batch, other board: another legal suffix, case and spacing
+            posting("data  engineer", company="ACME", source="Other"),
+        ])
+        self.assertEqual(stats, {'inserted': 1, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(self.store.count(), 1)
+
+        stats = self.store.upsert([posting("Data Engineer", company="Acme LLC", source="Other")])
+        self.assertEqual(stats['updated'], 1)
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.upsert([posting("Data Engineer", company="Acme LLC", source="Other")]),
+                         {'inserted': 0, 'updated': 0, 'unchanged': 1})
+
+        # Different location is a different posting
+        self.store.upsert([posting("Data Engineer", company="Acme", location="Berlin")])
+        self.assertEqual(self.store.count(), 2)
+
+    def test_unchanged_postings_keep_their_sequence_number(self):
+        self.store.upsert([posting("Data Engineer")])
+        seq = self.store.max_seq()
+
+        self.store.upsert([posting("Data Engineer")])
+
+        self.assertEqual(self.store.max_seq(), seq)
+        self.assertEqual(list(self.store.iter_changes(seq)), [])
+
+    def test_get_by_url_ignores_tracking_parameters(self):
+        self.store.upsert([posting("Data Engineer", url="https://jobs.example.com/view/1?id=5&utm_source=feed"),
+                           posting("Data Analyst", url="")])
+
+        job = self.store.get_by_url("https://JOBS.example.com/view/1/?gclid=abc&id=5")
+        self.assertEqual(job['title'], "Data Engineer")
+        self.assertIsNone(self.store.get_by_url("https://jobs.example.com/view/2"))
+        # Postings without a URL are not found by an empty one
+        self.assertIsNone(self.store.get_by_url(""))
+
+    def test_sequence_numbers_are_not_reused_after_expiry(self):
+        self.store.upsert([posting("Data Engineer")])
+        watermark = self.store.max_seq()
+        self.assertEqual(self.store.expire(max_age=-1), 1)
+
+        self.store.upsert([posting("Backend Developer")])
+
+        changes = list(self.store.iter_changes(watermark))
+        self.assertEqual([job['title'] for _, job in changes], ["Backend Developer"])
+        self.assertGreater(changes[0][0], watermark)
+        self.assertEqual(self.store.max_seq(), changes[0][0])
+
+    def test_sequence_counter_survives_reopening(self):
+        self.store.upsert([posting("Data Engineer"), posting("Data Analyst")])
+        watermark = self.store.max_seq()
+        self.store.expire(max_age=-1)
+        self.store._conn.close()
+
+        self.store = JobStore(self.path)
+        self.assertEqual(self.store.max_seq(), watermark)
+        self.store.upsert([posting("Backend Developer")])
+        self.assertEqual([job['title'] for job in self.store.iter_jobs(watermark)], ["Backend Developer"])
+
+if __name__ == '__main__':
+    unittest.main()
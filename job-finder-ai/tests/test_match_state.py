@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.job_store import JobStore, job_fingerprint
+from modules.match_state import IncrementalMatcher, MatchStateStore
+
+RESUME = {'skills': ["Python", "SQL"], 'experience_level': "Mid Level", 'job_titles': []}
+
+def posting(title, description, **fields):
+    return {'title': title, 'company': "Acme", 'location': "Remote", 'job_type': "Full-time",
+            'url': f"https://jobs.example.com/{title.lower().replace(' ', '-')}", 'description': description,
+            'source': "Test", **fields}
+
+class IncrementalMatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JobStore(str(Path(self.directory.name) / "jobs.sqlite3"))
+        self.state = MatchStateStore(str(Path(self.directory.name) / "state.sqlite3"))
+        self.store.upsert([
+            posting("Python Developer", "Python and SQL services"),
+            posting("Data Analyst", "SQL reporting"),
+            posting("Pastry Chef", "Croissants and bread"),
+        ])
+        self.matcher = IncrementalMatcher(self.store, self.state, top_k=2)
+
+    def tearDown(self):
+        self.store._conn.close()
+        self.state._conn.close()
+        self.directory.cleanup()
+
+    def expire(self, job):
+        """Age one posting past the expiry cutoff and expire it"""
+        self.store._conn.execute('UPDATE jobs SET last_seen = 0 WHERE fingerprint = ?', (job_fingerprint(job),))
+        self.store.expire()
+
+    def titles(self, matches):
+        return [match['title'] for match in matches]
+
+    def test_first_update_rescores_everything_and_reports_the_top_k(self):
+        matches = self.matcher.update("u1", RESUME)
+
+        self.assertEqual(self.titles(matches), ["Python Developer", "Data Analyst"])
+        self.assertEqual(self.matcher.stats, {'incremental': 0, 'full': 1})
+
+    def test_only_new_jobs_are_reported_on_later_updates(self):
+        self.matcher.update("u1", RESUME)
+        self.assertEqual(self.matcher.update("u1", RESUME), [])
+
+        self.store.upsert([posting("Senior Python Engineer", "Python SQL Python SQL")])
+        matches = self.matcher.update("u1", RESUME)
+
+        self.assertEqual(self.titles(matches), ["Senior Python Engineer"])
+        self.assertEqual(self.matcher.stats, {'incremental': 2, 'full': 1})
+
+    def test_job_inserted_after_an_expiry_reaches_the_subscriber(self):
+        self.matcher.update("u1", RESUME)
+        # The newest posting, outside the subscriber's top-k, goes away
+        self.expire(posting("Pastry Chef", ""))
+
+        self.store.upsert([posting("Python SQL Engineer", "Python SQL Python SQL")])
+        matches = self.matcher.update("u1", RESUME)
+
+        self.assertEqual(self.titles(matches), ["Python SQL Engineer"])
+        self.assertEqual(self.matcher.stats['incremental'], 1)
+
+    def test_changed_resume_forces_a_full_rescore(self):
+        self.matcher.update("u1", RESUME)
+        self.matcher.update("u1", dict(RESUME, skills=["Croissants"]))
+
+        self.assertEqual(self.matcher.stats, {'incremental': 0, 'full': 2})
+
+    def test_expired_kept_job_forces_a_full_rescore(self):
+        self.matcher.update("u1", RESUME)
+        self.expire(posting("Data Analyst", ""))
+
+        self.matcher.update("u1", RESUME)
+
+        self.assertEqual(self.matcher.stats, {'incremental': 0, 'full': 2})
+        kept = [fingerprint for _, fingerprint in self.state.get("u1")['top_matches']]
+        self.assertNotIn(job_fingerprint(posting("Data Analyst", "")), kept)
+
+    def test_changed_kept_job_forces_a_full_rescore(self):
+        self.matcher.update("u1", RESUME)
+        self.store.upsert([posting("Data Analyst", "SQL reporting and dashboards")])
+
+        self.matcher.update("u1", RESUME)
+
+        self.assertEqual(self.matcher.stats, {'incremental': 0, 'full': 2})
+
+if __name__ == '__main__':
+    unittest.main()
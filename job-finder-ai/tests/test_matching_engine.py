@@ -0,0 +1,129 @@
+import random
+import unittest
+
+from modules.job_index import JobIndex
+from modules.matching_engine import MatchingEngine
+from modules.utils import tokenize
+
+JOBS = [
+    {'title': "Backend Developer", 'company': "Acme", 'description': "Python services backed by SQL"},
+    {'title': "Data Analyst", 'company': "Globex", 'description': "SQL reporting and dashboards"},
+    {'title': "Site Engineer", 'company': "Initech", 'description': "Kubernetes and Python tooling"},
+]
+
+def resume(*skills, experience_level="Mid Level"):
+    return {'skills': list(skills), 'experience_level': experience_level}
+
+WORDS = ["python", "sql", "react", "docker", "aws", "java", "senior", "junior", "team", "product",
+         "machine learning", "data", "api", "5 years", "services"]
+SKILLS = ["Python", "SQL", "React", "Docker", "AWS", "Java", "Machine Learning", "Go"]
+LEVELS = ["Entry Level", "Mid Level", "Senior Level", ""]
+
+def random_jobs(rng, count):
+    return [{'title': " ".join(rng.sample(WORDS, 2)).title(), 'company': f"Company {doc_id}",
+             'url': f"https://jobs.example.com/{doc_id}",
+             'description': " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30)))}
+            for doc_id in range(count)]
+
+def random_resume(rng):
+    return resume(*rng.sample(SKILLS, rng.randint(1, 4)), experience_level=rng.choice(LEVELS))
+
+class SkillWeightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = MatchingEngine()
+        self.index = JobIndex(JOBS)
+
+    def scores(self, resume_data):
+        return {match['title']: match['match_score']
+                for match in self.engine.find_best_matches(resume_data, JOBS, top_k=len(JOBS), index=self.index)}
+
+    def test_skills_no_job_mentions_do_not_lower_scores(self):
+        expected = self.scores(resume("Python", "SQL"))
+
+        for extra in ("COBOL", "!!!"):
+            with self.subTest(extra=extra):
+                self.assertEqual(self.scores(resume("Python", "SQL", extra)), expected)
+
+    def test_batch_scoring_leaves_the_same_skills_out(self):
+        resumes = [resume("Python", "SQL"), resume("Python", "SQL", "COBOL"), resume("COBOL")]
+
+        batch = self.engine.find_best_matches_batch(resumes, JOBS, top_k=len(JOBS), index=self.index)
+
+        self.assertEqual(batch[1], batch[0])
+        self.assertEqual(batch[2], [])
+
+class RankingTest(unittest.TestCase):
+    """find_best_matches stops scoring early; it must rank exactly like scoring every job"""
+
+    def setUp(self):
+        self.engine = MatchingEngine()
+
+    def brute_force(self, resume_data, index, top_k):
+        """Score every job mentioning a skill; best score first, ties to the earlier job"""
+        user_skills = [(skill.lower(), tokenize(skill)) for skill in resume_data['skills']]
+        skills_scores = self.engine._calculate_skills_scores(index, user_skills)
+        scored = [(self.engine._calculate_match_score(index, doc_id, float(skills_scores[doc_id]),
+                                                      user_skills, resume_data['experience_level']), doc_id)
+                  for doc_id in range(len(index)) if skills_scores[doc_id] > 0]
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [(index.jobs[doc_id]['url'], score) for score, doc_id in scored[:top_k]]
+
+    def ranking(self, matches):
+        return [(match['url'], match['match_score']) for match in matches]
+
+    def assertSameRanking(self, actual, expected):
+        self.assertEqual([url for url, _ in actual], [url for url, _ in expected])
+        for (_, actual_score), (_, expected_score) in zip(actual, expected):
+            self.assertAlmostEqual(actual_score, expected_score, places=9)
+
+    def test_matches_scoring_every_job(self):
+        rng = random.Random(7)
+        for case in range(30):
+            jobs = random_jobs(rng, rng.randint(1, 60))
+            index = JobIndex(jobs)
+            resume_data = random_resume(rng)
+            top_k = rng.randint(1, 10)
+            with self.subTest(case=case):
+                matches = self.engine.find_best_matches(resume_data, jobs, top_k=top_k, index=index)
+                self.assertSameRanking(self.ranking(matches), self.brute_force(resume_data, index, top_k))
+
+    def test_tied_scores_go_to_the_earlier_job(self):
+        jobs = [dict(JOBS[0], url=f"https://jobs.example.com/{doc_id}") for doc_id in range(6)]
+        index = JobIndex(jobs)
+
+        matches = self.engine.find_best_matches(resume("Python"), jobs, top_k=3, index=index)
+
+        self.assertEqual(len({match['match_score'] for match in matches}), 1)
+        self.assertEqual(self.ranking(matches), self.brute_force(resume("Python"), index, 3))
+        self.assertEqual([match['url'] for match in matches],
+                         [f"https://jobs.example.com/{doc_id}" for doc_id in range(3)])
+
+    def test_top_k_larger_than_the_candidates_returns_every_candidate(self):
+        jobs = [dict(job, url=f"https://jobs.example.com/{doc_id}") for doc_id, job in enumerate(JOBS)]
+        index = JobIndex(jobs)
+
+        matches = self.engine.find_best_matches(resume("SQL"), jobs, top_k=50, index=index)
+
+        self.assertEqual(self.ranking(matches), self.brute_force(resume("SQL"), index, 50))
+        self.assertEqual(len(matches), 2)
+
+    def test_batch_ranks_like_the_single_resume_path(self):
+        rng = random.Random(11)
+        # Repeated postings make ties that both paths must break by job order
+        jobs = random_jobs(rng, 40)
+        jobs += [dict(job, url=job['url'] + "/repost") for job in jobs[:10]]
+        index = JobIndex(jobs)
+        resumes = [random_resume(rng) for _ in range(25)]
+
+        for top_k in (1, 5, 100):
+            # Small chunks exercise merging the top k across resume and job blocks
+            batch = self.engine.find_best_matches_batch(resumes, jobs, top_k=top_k, index=index,
+                                                        resume_chunk_size=7, job_chunk_size=16)
+            for position, resume_data in enumerate(resumes):
+                with self.subTest(top_k=top_k, resume=position):
+                    single = self.engine.find_best_matches(resume_data, jobs, top_k=top_k, index=index)
+                    self.assertSameRanking(self.ranking(batch[position]), self.ranking(single))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from modules.job_store import job_fingerprint
+from modules.near_duplicates import NearDuplicateDetector, job_shingles, lsh_bands
+
+DESCRIPTION = ("We are hiring a backend engineer to build Python services on AWS. You will design APIs, "
+               "own PostgreSQL schemas, review code and mentor two junior developers on the payments team.")
+
+def posting(location="Berlin", **fields):
+    return {'title': "Senior Backend Engineer", 'company': "Acme Inc", 'location': location,
+            'description': DESCRIPTION, **fields}
+
+class NearDuplicateDetectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = NearDuplicateDetector(threshold=0.8)
+
+    def test_reworded_repost_is_a_duplicate(self):
+        repost = posting(title="Sr. Backend Eng", company="ACME",
+                         description=DESCRIPTION + " Apply today.")
+
+        self.assertTrue(self.detector.add(posting()))
+        self.assertFalse(self.detector.add(repost))
+        self.assertEqual(len(self.detector), 1)
+
+    def test_same_role_in_other_locations_is_kept(self):
+        jobs = [posting("Berlin"), posting("Munich"), posting("Remote"), posting("berlin")]
+
+        kept = self.detector.filter(jobs)
+
+        # Only the posting whose location normalizes to one already seen is dropped
+        self.assertEqual([job['location'] for job in kept], ["Berlin", "Munich", "Remote"])
+        self.assertEqual(len({job_fingerprint(job) for job in kept}), 3)
+
+    def test_different_roles_are_kept(self):
+        other = posting(title="Pastry Chef", description="Bake croissants, bread and seasonal tarts every morning.")
+
+        self.assertEqual(len(self.detector.filter([posting(), other])), 2)
+
+    def test_title_abbreviations_and_company_suffixes_shingle_alike(self):
+        self.assertEqual(job_shingles(posting(title="Sr Backend Eng", company="Acme")),
+                         job_shingles(posting()))
+
+    def test_lsh_bands_cross_half_near_the_threshold(self):
+        for threshold in (0.5, 0.8, 0.9):
+            bands, rows = lsh_bands(threshold, 128)
+            self.assertLessEqual(bands * rows, 128)
+            self.assertAlmostEqual((1 / bands) ** (1 / rows), threshold, delta=0.05)
+
+if __name__ == '__main__':
+    unittest.main()
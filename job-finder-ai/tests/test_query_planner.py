@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.query_planner import SearchQuery, execute_plan, plan_queries
+from modules.skill_store import SkillStore, build_skill_store
+
+class RecordingScraper:
+    """Stands in for JobScraper: records each search and returns one job per skill"""
+
+    def __init__(self):
+        self.searches = []
+
+    def stream_jobs(self, skills, location, max_jobs):
+        self.searches.append((tuple(skills), location, max_jobs))
+        yield "Test", [{'title': f"{skill} Developer", 'location': location} for skill in skills]
+
+class QueryPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = Path(self.directory.name) / "skills.bin"
+        build_skill_store({"JavaScript": ["JS"], "Python": ["py"], "SQL": [], "AWS": [], "Docker": []}, {}, path)
+        self.skill_store = SkillStore(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def plan(self, searches, **options):
+        return plan_queries(searches, skill_store=self.skill_store, **options)
+
+    def test_aliases_order_and_case_give_one_query(self):
+        plan = self.plan([("u1", ["JS", "Python"], "Remote"),
+                          ("u2", ["python", "JavaScript"], "Remote"),
+                          ("u3", ["py", "js", "JS"], "Remote")])
+
+        self.assertEqual(list(plan.queries), [SearchQuery(("JavaScript", "Python"), "Remote")])
+        self.assertEqual(plan.stats()['requested_queries'], 1)
+
+    def test_narrower_query_is_served_by_the_most_specific_broader_one(self):
+        plan = self.plan([("broad", ["Python", "SQL"], "Remote"),
+                          ("middle", ["Python", "SQL", "AWS"], "Remote"),
+                          ("narrow", ["Python", "SQL", "AWS", "Docker"], "Remote"),
+                          ("elsewhere", ["Python", "SQL", "AWS"], "Berlin")])
+
+        broad = SearchQuery(("Python", "SQL"), "Remote")
+        self.assertEqual(plan.assignments["middle"], broad)
+        self.assertEqual(plan.assignments["narrow"], broad)
+        # Subsumption only holds within one location
+        self.assertEqual(plan.assignments["elsewhere"], SearchQuery(("AWS", "Python", "SQL"), "Berlin"))
+        self.assertEqual(plan.served[broad], 3)
+        self.assertEqual(plan.stats()['reduction'], 2.0)
+
+    def test_queries_with_too_few_skills_serve_only_themselves(self):
+        plan = self.plan([("one", ["Python"], "Remote"), ("two", ["Python", "SQL"], "Remote")])
+
+        self.assertEqual(len(plan), 2)
+        self.assertEqual(plan.served, {SearchQuery(("Python",), "Remote"): 1,
+                                       SearchQuery(("Python", "SQL"), "Remote"): 1})
+
+    def test_subsuming_queries_scrape_a_budget_per_distinct_search_they_serve(self):
+        plan = self.plan([("broad", ["Python", "SQL"], "Remote"),
+                          ("narrow", ["Python", "SQL", "AWS"], "Remote"),
+                          # Same search as "narrow": more users, not more jobs to find
+                          ("narrow again", ["aws", "sql", "py"], "Remote"),
+                          ("alone", ["Docker", "JS"], "Remote")])
+        scraper = RecordingScraper()
+
+        results = execute_plan(plan, scraper, max_jobs=50)
+
+        self.assertEqual(sorted(scraper.searches), [
+            (("Docker", "JavaScript"), "Remote", 50),
+            (("Python", "SQL"), "Remote", 100),
+        ])
+        self.assertEqual(set(results), set(plan.queries))
+        self.assertEqual(len(results[SearchQuery(("Python", "SQL"), "Remote")]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
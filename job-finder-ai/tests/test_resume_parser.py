@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+
+from modules import reporting
+from modules.resume_cache import ResumeCache
+from modules.resume_parser import ResumeParser
+
+PDF = "application/pdf"
+
+class TruncatedPdfParser(ResumeParser):
+    """Reads the first page of every PDF, then fails like a file cut off mid-upload"""
+
+    def __init__(self, cache, failures=1):
+        super().__init__(cache=cache)
+        self.failures = failures
+        self.reads = 0
+
+    def _iter_text_from_pdf(self, file):
+        self.reads += 1
+        yield "Jane Doe\nSkills: Python, SQL"
+        if self.failures:
+            self.failures -= 1
+            raise ValueError("EOF marker not found")
+        yield "Experience: 5 years of Docker"
+
+class ResumeParserCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResumeCache(self.directory.name)
+        self.reports = []
+        reporting.set_reporter(lambda level, message: self.reports.append(message))
+
+    def tearDown(self):
+        reporting.set_reporter(None)
+        self.directory.cleanup()
+
+    def test_parse_cut_short_by_a_read_error_is_not_cached(self):
+        parser = TruncatedPdfParser(self.cache)
+
+        partial = parser.parse_bytes(b"%PDF-1.4 resume", PDF)
+        self.assertIn("Python", partial['skills'])
+        self.assertEqual(self.reports, ["Error reading PDF: EOF marker not found"])
+        self.assertIsNone(self.cache.get(self.cache.key(b"%PDF-1.4 resume")))
+
+        # The same file read cleanly the next time is parsed again and then cached
+        complete = parser.parse_bytes(b"%PDF-1.4 resume", PDF)
+        self.assertIn("Docker", complete['skills'])
+        self.assertEqual(parser.parse_bytes(b"%PDF-1.4 resume", PDF), complete)
+        self.assertEqual(parser.reads, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import unittest
+
+from modules.semantic_index import DEFAULT_MODEL, collection_name
+
+class CollectionNameTest(unittest.TestCase):
+
+    def test_each_model_gets_its_own_valid_collection(self):
+        models = [DEFAULT_MODEL, "BAAI/bge-small-en-v1.5", "BAAI/bge-small-en-v1_5", "m" * 200]
+        names = [collection_name(model) for model in models]
+
+        self.assertEqual(len(set(names)), len(models))
+        for name in names:
+            # Chroma's rule: 3-63 characters from [a-zA-Z0-9._-], starting and ending alphanumeric
+            self.assertRegex(name, r'^[a-zA-Z0-9][a-zA-Z0-9._-]{1,61}[a-zA-Z0-9]$')
+        self.assertEqual(collection_name(DEFAULT_MODEL), names[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.skill_store import HEADER, SkillStore, build_skill_store, load_taxonomy
+from modules.utils import get_default_skills
+
+SKILLS = {
+    "Python": {'aliases': ["py", "Python3"], 'categories': ["Backend"]},
+    "JavaScript": {'aliases': ["JS", "ECMAScript"]},
+    "Node.js": {'aliases': ["node", "js"]},
+    "Résumé Writing": {'aliases': []},
+}
+CATEGORIES = {'Backend': ["node", "Go"], 'Frontend': ["js", "CSS"]}
+
+class SkillStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        # Registered first so it runs after the stores' maps are closed
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name)
+
+    def write(self, name, data):
+        path = self.directory / name
+        path.write_text(json.dumps(data), encoding='utf-8')
+        return path
+
+    def compile(self, skills, categories):
+        taxonomy = load_taxonomy(self.write("skills.json", skills), self.write("categories.json", categories))
+        build_skill_store(*taxonomy, self.directory / "skills.bin")
+        store = SkillStore(self.directory / "skills.bin")
+        self.addCleanup(store._mmap.close)
+        return taxonomy, store
+
+    def test_round_trip_from_json_sources(self):
+        (skills, categories), store = self.compile(SKILLS, CATEGORIES)
+
+        # Category members missing from the skills file become skills of their own
+        self.assertEqual(list(store), [*skills, "Go", "CSS"])
+        for name, aliases in skills.items():
+            for spelling in [name, name.upper(), f"  {name.lower()} ", *aliases]:
+                if spelling.lower() != "js":
+                    self.assertEqual(store.canonical(spelling), name)
+        # The first skill to claim an alias keeps it
+        self.assertEqual(store.canonical("JS"), "JavaScript")
+        self.assertIsNone(store.lookup("Haskell"))
+
+        self.assertEqual(store.categories(), ["Backend", "Frontend"])
+        self.assertEqual(store.category_skills("Backend"), ["Python", "Node.js", "Go"])
+        self.assertEqual(store.category_skills("Frontend"), ["JavaScript", "CSS"])
+        self.assertEqual(store.skill_categories("node"), ["Backend"])
+        self.assertEqual(store.skill_categories("Résumé Writing"), [])
+
+    def test_list_and_alias_map_formats(self):
+        _, listed = self.compile(["Python", "SQL"], {})
+        self.assertEqual(list(listed), ["Python", "SQL"])
+
+        _, mapped = self.compile({"PostgreSQL": ["postgres", "psql"], "SQL": None}, {})
+        self.assertEqual(mapped.canonical("PSQL"), "PostgreSQL")
+        self.assertEqual(list(mapped), ["PostgreSQL", "SQL"])
+
+    def test_empty_skills_file_falls_back_to_the_default_skills(self):
+        empty = self.directory / "empty.json"
+        empty.write_text("\n", encoding='utf-8')
+
+        skills, categories = load_taxonomy(empty, empty)
+
+        self.assertEqual(list(skills), get_default_skills())
+        self.assertEqual(categories, {})
+
+    def test_store_from_another_version_is_rejected(self):
+        _, store = self.compile(["Python"], {})
+        data = bytearray((self.directory / "skills.bin").read_bytes())
+        HEADER.pack_into(data, 0, b'SKST', 0, *HEADER.unpack_from(data)[2:])
+        (self.directory / "old.bin").write_bytes(bytes(data))
+
+        with self.assertRaises(ValueError):
+            SkillStore(self.directory / "old.bin")
+
+if __name__ == '__main__':
+    unittest.main()